@@ -18,6 +18,7 @@ class Settings:
         self.embedding_model = "all-MiniLM-L6-v2"
         self.similarity_threshold = 0.7
         self.max_memories = 10000
+        self.warmup = os.getenv("ECHOMIND_WARMUP", "1") == "1"  # dummy encode at startup
         
         # Create directories
         self.data_dir.mkdir(exist_ok=True)
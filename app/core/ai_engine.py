@@ -1,32 +1,63 @@
 # app/core/ai_engine.py
 import numpy as np
 from sentence_transformers import SentenceTransformer
-from sklearn.neighbors import NearestNeighbors
+from collections import deque
+from functools import lru_cache
 from typing import List, Dict, Optional, Any
 import logging
+import time
 from datetime import datetime, timezone
 
 from app.config import settings
 from app.core.memory_store import SupabaseMemoryStore
+from app.core.dedup import NearDuplicateIndex
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Top matches considered per query
+TOP_K_MATCHES = 5
+
+def _dedup_tag(output_text: str) -> str:
+    """Normalized answer text; a teach is only a duplicate if the answer matches too"""
+    return " ".join(output_text.lower().split())
+
+def _cache_entry(memory_id: int, item: Dict, created_at: str) -> Dict:
+    """Search-cache row for a memory that was just inserted"""
+    return {
+        'id': memory_id,
+        'input_text': item['input_text'],
+        'output_text': item['output_text'],
+        'context': item.get('context'),
+        'category': item.get('category', 'general'),
+        'confidence': 1.0,
+        'created_at': created_at,
+        'is_active': True
+    }
+
+@lru_cache(maxsize=None)
+def load_embedding_model(model_name: str) -> SentenceTransformer:
+    """Load an embedding model once per process and share it between engines"""
+    return SentenceTransformer(model_name, cache_folder=str(settings.model_cache_dir))
+
 class PrivacyFirstAI:
     def __init__(self):
         self.memory_store = SupabaseMemoryStore()
         self.embedding_model = None
-        self.knn_model = None
         
         # Performance optimizations
         self._memory_cache = []
         self._embedding_cache = np.array([])
+        self._dedup_index = None
         self._pending_updates = 0
         self._last_full_update = datetime.now(timezone.utc)
         self._update_threshold = 10  # Update after 10 new memories
+        # Memory/rule counts, refreshed from the DB on every full update and
+        # adjusted locally in between so health checks skip COUNT queries
+        self._stats = {'memory_count': 0, 'rule_count': 0}
         
         # Enhanced features placeholder
-        self.conversation_history = []
+        self.conversation_history = deque()
         self.user_profile = {
             "interests": set(),
             "topics_discussed": set(),
@@ -42,17 +73,15 @@ class PrivacyFirstAI:
         """Load embedding model and initialize ML components"""
         try:
             logger.info("Loading embedding model...")
-            self.embedding_model = SentenceTransformer(
-                settings.embedding_model, 
-                cache_folder=str(settings.model_cache_dir)
-            )
-            logger.info("Embedding model loaded successfully")
+            start = time.perf_counter()
+            self.embedding_model = load_embedding_model(settings.embedding_model)
+            logger.info(f"Embedding model loaded successfully in {time.perf_counter() - start:.2f}s")
+            
+            if settings.warmup:
+                self._warmup()
             
-            # Initialize KNN model
-            self.knn_model = NearestNeighbors(
-                n_neighbors=5,  # Get top 5 matches
-                metric='cosine', 
-                algorithm='brute'
+            self._dedup_index = NearDuplicateIndex(
+                self.embedding_model.get_sentence_embedding_dimension()
             )
             
             # Load initial knowledge base
@@ -62,6 +91,31 @@ class PrivacyFirstAI:
             logger.error(f"Error loading models: {e}")
             raise
     
+    def _warmup(self):
+        """Run a dummy batch so the first real query doesn't pay one-time setup costs"""
+        start = time.perf_counter()
+        self._encode(["warmup", "warmup"])
+        logger.info(f"Embedding model warmed up in {time.perf_counter() - start:.2f}s")
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into unit-normalized float32 embeddings"""
+        return self.embedding_model.encode(texts, normalize_embeddings=True).astype(np.float32)
+    
+    def _index_memories(self, memories: List[Dict], embeddings: np.ndarray):
+        """Register memories with the near-duplicate index"""
+        for memory, embedding in zip(memories, embeddings):
+            self._dedup_index.add(memory['id'], embedding, _dedup_tag(memory['output_text']))
+    
+    def _append_to_cache(self, memories: List[Dict], embeddings: np.ndarray):
+        """Add already-embedded memories to the search caches"""
+        if self._embedding_cache.size == 0:
+            self._embedding_cache = embeddings
+        else:
+            self._embedding_cache = np.vstack([self._embedding_cache, embeddings])
+        
+        self._memory_cache.extend(memories)
+        self._index_memories(memories, embeddings)
+    
     def _update_knowledge_base(self, incremental=False):
         """Update knowledge base with optional incremental updates"""
         try:
@@ -73,16 +127,9 @@ class PrivacyFirstAI:
                 
                 if new_memories:
                     new_texts = [mem['input_text'] for mem in new_memories]
-                    new_embeddings = self.embedding_model.encode(new_texts)
+                    new_embeddings = self._encode(new_texts)
                     
-                    # Add to existing cache
-                    if self._embedding_cache.size == 0:
-                        self._embedding_cache = new_embeddings
-                    else:
-                        self._embedding_cache = np.vstack([self._embedding_cache, new_embeddings])
-                    
-                    self._memory_cache.extend(new_memories)
-                    self.knn_model.fit(self._embedding_cache)
+                    self._append_to_cache(new_memories, new_embeddings)
                     logger.info(f"Incrementally added {len(new_memories)} memories")
             else:
                 # Full update
@@ -91,12 +138,15 @@ class PrivacyFirstAI:
                 
                 if memories:
                     texts = [mem['input_text'] for mem in memories]
-                    self._embedding_cache = self.embedding_model.encode(texts)
-                    self.knn_model.fit(self._embedding_cache)
+                    self._embedding_cache = self._encode(texts)
+                    self._dedup_index.clear()
+                    self._index_memories(memories, self._embedding_cache)
                     logger.info(f"Knowledge base updated with {len(memories)} memories")
                 else:
                     self._embedding_cache = np.array([])
+                    self._dedup_index.clear()
                     
+                self._stats = self.memory_store.get_stats()
                 self._last_full_update = datetime.now(timezone.utc)
                 
             self._pending_updates = 0
@@ -106,10 +156,40 @@ class PrivacyFirstAI:
             # Fall back to full update
             self._update_knowledge_base(incremental=False)
     
+    def _note_external_writes(self, count: int = 1):
+        """Record memories written straight to the DB without their embeddings.
+
+        They reach the search caches through the incremental update: right
+        away once enough have piled up (or the last full update is stale),
+        otherwise on the next ask().
+        """
+        if count <= 0:
+            return
+        self._pending_updates += count
+        self._stats['memory_count'] += count
+        
+        time_since_update = (datetime.now(timezone.utc) - self._last_full_update).total_seconds()
+        if (self._pending_updates >= self._update_threshold or 
+            time_since_update > 300):  # 5 minutes
+            self._update_knowledge_base(incremental=True)
+    
     def teach(self, input_text: str, output_text: str, context: str = None, 
               category: str = "general") -> Dict:
         """Teach the AI new knowledge with performance optimizations"""
         try:
+            # Skip near-duplicates of something already taught
+            embedding = self._encode([input_text])[0]
+            tag = _dedup_tag(output_text)
+            duplicate_id = self._dedup_index.find(embedding, tag)
+            if duplicate_id is not None:
+                logger.info(f"Skipped near-duplicate of memory ID: {duplicate_id}")
+                return {
+                    "status": "duplicate",
+                    "memory_id": duplicate_id,
+                    "category": category,
+                    "pending_updates": self._pending_updates
+                }
+            
             # Store in database first
             memory_id = self.memory_store.add_memory(
                 input_text=input_text,
@@ -119,15 +199,17 @@ class PrivacyFirstAI:
                 embedding=None  # Don't store embedding in DB for now
             )
             
-            # Incremental update instead of full rebuild
-            self._pending_updates += 1
-            
-            # Update knowledge base if we've accumulated enough changes
-            # or if it's been a while since last full update
-            time_since_update = (datetime.now(timezone.utc) - self._last_full_update).total_seconds()
-            if (self._pending_updates >= self._update_threshold or 
-                time_since_update > 300):  # 5 minutes
-                self._update_knowledge_base(incremental=True)
+            # The embedding is already computed, so the memory goes straight
+            # into the search caches (and dedup index) instead of being
+            # re-encoded by an incremental update
+            memory = _cache_entry(memory_id, {
+                'input_text': input_text,
+                'output_text': output_text,
+                'context': context,
+                'category': category
+            }, datetime.now(timezone.utc).isoformat())
+            self._append_to_cache([memory], embedding[np.newaxis, :])
+            self._stats['memory_count'] += 1
             
             logger.info(f"Taught new memory (ID: {memory_id}) - Pending updates: {self._pending_updates}")
             return {
@@ -141,6 +223,87 @@ class PrivacyFirstAI:
             logger.error(f"Error teaching AI: {e}")
             return {"status": "error", "message": str(e)}
     
+    def teach_bulk(self, items: List[Dict]) -> Dict:
+        """Teach many memories with one batched encode and one insert"""
+        try:
+            # Exact repeats (e.g. re-running a training script, or the same
+            # item twice in one batch) are dropped before encoding, so they
+            # cost no forward pass at all
+            known = {
+                (memory['input_text'], _dedup_tag(memory['output_text'])): memory['id']
+                for memory in self._memory_cache
+            }
+            pending = {}  # key -> index in to_encode, for repeats within the batch
+            duplicate_ids, to_encode, batch_repeats = [], [], []
+            for item in items:
+                key = (item['input_text'], _dedup_tag(item['output_text']))
+                if key in known:
+                    duplicate_ids.append(known[key])
+                elif key in pending:
+                    batch_repeats.append(pending[key])
+                else:
+                    pending[key] = len(to_encode)
+                    to_encode.append(item)
+            
+            embeddings = self._encode([item['input_text'] for item in to_encode]) if to_encode else []
+            
+            # Skip near-duplicates of something already taught, or of an
+            # earlier item of this batch (indexed by its position in new_items
+            # until the insert assigns real ids)
+            batch_index = NearDuplicateIndex(embeddings.shape[1]) if to_encode else None
+            new_items, new_embeddings, batch_duplicates = [], [], []
+            origins = []  # per to_encode item: ("memory", id) or ("batch", position)
+            for item, embedding in zip(to_encode, embeddings):
+                tag = _dedup_tag(item['output_text'])
+                duplicate_id = self._dedup_index.find(embedding, tag)
+                if duplicate_id is not None:
+                    duplicate_ids.append(duplicate_id)
+                    origins.append(("memory", duplicate_id))
+                    continue
+                position = batch_index.find(embedding, tag)
+                if position is not None:
+                    batch_duplicates.append(position)
+                    origins.append(("batch", position))
+                    continue
+                batch_index.add(len(new_items), embedding, tag)
+                origins.append(("batch", len(new_items)))
+                new_items.append(item)
+                new_embeddings.append(embedding)
+            
+            memory_ids = self.memory_store.add_memories(new_items) if new_items else []
+            
+            # In-batch duplicates point at the memory their first occurrence became
+            def resolve(origin):
+                kind, value = origin
+                return memory_ids[value] if kind == "batch" else value
+            
+            duplicate_ids.extend(memory_ids[position] for position in batch_duplicates)
+            duplicate_ids.extend(resolve(origins[index]) for index in batch_repeats)
+            
+            # The embeddings are already computed, so the new memories go
+            # straight into the search caches instead of waiting for an update
+            if memory_ids:
+                now = datetime.now(timezone.utc).isoformat()
+                memories = [
+                    _cache_entry(memory_id, item, now)
+                    for memory_id, item in zip(memory_ids, new_items)
+                ]
+                self._append_to_cache(memories, np.vstack(new_embeddings))
+                self._stats['memory_count'] += len(memory_ids)
+            
+            logger.info(f"Bulk taught {len(memory_ids)} memories, skipped {len(duplicate_ids)} duplicates")
+            return {
+                "status": "learned",
+                "learned": len(memory_ids),
+                "memory_ids": memory_ids,
+                "duplicates": len(duplicate_ids),
+                "duplicate_ids": duplicate_ids
+            }
+            
+        except Exception as e:
+            logger.error(f"Error bulk teaching AI: {e}")
+            return {"status": "error", "message": str(e)}
+    
     def ask(self, query: str, threshold: float = None) -> Dict:
         """Query the AI with performance optimizations"""
         if threshold is None:
@@ -192,21 +355,26 @@ class PrivacyFirstAI:
     
     def _check_memories(self, query: str, threshold: float) -> Optional[Dict]:
         """Check memories with multiple candidate matches"""
-        query_embedding = self.embedding_model.encode([query])
+        query_embedding = self._encode([query])[0]
         
         if len(self._embedding_cache) > 0:
-            # Get top 5 matches instead of just 1
-            distances, indices = self.knn_model.kneighbors(query_embedding, n_neighbors=min(5, len(self._embedding_cache)))
+            # Embeddings are unit-normalized, so one float32 mat-vec (BLAS)
+            # gives every cosine; argpartition then picks the top k
+            scores = self._embedding_cache @ query_embedding
+            n_matches = min(TOP_K_MATCHES, len(scores))
+            candidates = np.argpartition(scores, -n_matches)[-n_matches:]
+            similarities = scores[candidates]
+            ranked = np.argsort(similarities)[::-1]
             
-            for i, (distance, index) in enumerate(zip(distances[0], indices[0])):
-                similarity = 1 - distance
+            # Get top 5 matches instead of just 1
+            for i, (similarity, index) in enumerate(zip(similarities[ranked], candidates[ranked])):
                 memory = self._memory_cache[index]
                 
                 # Return best match above threshold
                 if similarity > threshold:
                     return {
                         "response": memory['output_text'],
-                        "confidence": float(similarity),
+                        "confidence": min(float(similarity), 1.0),
                         "source": "memory",
                         "memory_id": memory['id'],
                         "match_rank": i + 1  # Show which rank this match was
@@ -218,15 +386,16 @@ class PrivacyFirstAI:
         """Add a behavior rule"""
         try:
             rule_id = self.memory_store.add_rule(pattern, action, priority)
+            self._stats['rule_count'] += 1
             logger.info(f"Added new rule (ID: {rule_id})")
             return {"status": "rule_added", "rule_id": rule_id}
         except Exception as e:
             logger.error(f"Error adding rule: {e}")
             return {"status": "error", "message": str(e)}
     
-    def get_memories(self, category: str = None, limit: int = 100) -> List[Dict]:
+    def get_memories(self, category: str = None, limit: int = 100, offset: int = 0) -> List[Dict]:
         """Get memories with optional filtering"""
-        return self.memory_store.get_active_memories(category, limit)
+        return self.memory_store.get_active_memories(category, limit, offset)
     
     def delete_memory(self, memory_id: int) -> Dict:
         """Delete a memory"""
@@ -241,6 +410,18 @@ class PrivacyFirstAI:
         except Exception as e:
             return {"status": "error", "message": str(e)}
     
+    def delete_memories(self, memory_ids: List[int]) -> Dict:
+        """Delete several memories with one store call and one rebuild"""
+        try:
+            deleted = self.memory_store.delete_memories(memory_ids)
+            if deleted:
+                # Force full update since we removed memories
+                self._update_knowledge_base(incremental=False)
+            not_found = sorted(set(memory_ids) - set(deleted))
+            return {"status": "deleted", "memory_ids": deleted, "not_found": not_found}
+        except Exception as e:
+            return {"status": "error", "message": str(e)}
+    
     def force_update(self):
         """Force a full knowledge base update"""
         self._update_knowledge_base(incremental=False)
@@ -248,11 +429,10 @@ class PrivacyFirstAI:
     
     def get_health(self) -> Dict:
         """Get system health information"""
-        stats = self.memory_store.get_stats()
         return {
             "status": "healthy",
-            "memory_count": stats['memory_count'],
-            "rule_count": stats['rule_count'],
+            "memory_count": self._stats['memory_count'],
+            "rule_count": self._stats['rule_count'],
             "model_loaded": self.embedding_model is not None,
             "knowledge_base_ready": len(self._memory_cache) > 0,
             "cache_size": len(self._memory_cache),
@@ -0,0 +1,43 @@
+# app/core/dedup.py
+import numpy as np
+from typing import Dict, Hashable, List, Optional, Tuple
+
+class NearDuplicateIndex:
+    """Random-projection LSH for finding near-duplicate embeddings.
+
+    Each table buckets a unit-normalized embedding by the signs of n_bits
+    random projections; several tables are used because one 12-bit hash
+    misses about half of the pairs at cosine 0.98.
+    """
+
+    def __init__(self, dim: int, n_tables: int = 4, n_bits: int = 12,
+                 threshold: float = 0.98, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self._planes = rng.standard_normal((n_tables, n_bits, dim)).astype(np.float32)
+        self._tables: List[Dict[bytes, Dict[int, Tuple[np.ndarray, Hashable]]]] = [
+            {} for _ in range(n_tables)
+        ]
+        self.threshold = threshold
+
+    def _keys(self, embedding: np.ndarray) -> List[bytes]:
+        """Bucket key of the embedding in every table"""
+        signs = (self._planes @ embedding) > 0
+        return [np.packbits(row).tobytes() for row in signs]
+
+    def clear(self):
+        """Drop every indexed embedding"""
+        for table in self._tables:
+            table.clear()
+
+    def add(self, memory_id: int, embedding: np.ndarray, tag: Hashable = None):
+        """Index an embedding; ``tag`` must also match for find() to report it"""
+        for table, key in zip(self._tables, self._keys(embedding)):
+            table.setdefault(key, {})[memory_id] = (embedding, tag)
+
+    def find(self, embedding: np.ndarray, tag: Hashable = None) -> Optional[int]:
+        """Return the id of an indexed near-duplicate, or None"""
+        for table, key in zip(self._tables, self._keys(embedding)):
+            for memory_id, (candidate, candidate_tag) in table.get(key, {}).items():
+                if candidate_tag == tag and float(candidate @ embedding) >= self.threshold:
+                    return memory_id
+        return None
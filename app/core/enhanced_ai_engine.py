@@ -1,5 +1,8 @@
 # app/core/enhanced_ai_engine.py
 import numpy as np
+import orjson
+from collections import deque
+from itertools import islice
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Any
 import logging
@@ -11,11 +14,15 @@ from app.core.auto_learner import AutoLearner
 logger = logging.getLogger(__name__)
 
 class EnhancedPrivacyAI(PrivacyFirstAI):
+    max_conversation_history = 20
+
     def __init__(self):
         super().__init__()
         
-        # Conversation memory
-        self.conversation_history = []
+        # Conversation memory (bounded, oldest entries drop off automatically)
+        self.conversation_history = deque(maxlen=self.max_conversation_history)
+        # Same entries, encoded once as NDJSON lines for /conversation-history
+        self._conversation_lines = deque(maxlen=self.max_conversation_history)
         self.user_profile = {
             "interests": set(),
             "topics_discussed": set(),
@@ -140,6 +147,7 @@ class EnhancedPrivacyAI(PrivacyFirstAI):
                             context=f"Researched from web: {', '.join(search_result['sources'])}",
                             category="researched_knowledge"
                         )
+                        self._note_external_writes(1)
                         logger.debug("💾 Also saved research to permanent memory")
                     except Exception as e:
                         logger.warning(f"⚠️ Failed to save research to memory: {e}")
@@ -163,7 +171,10 @@ class EnhancedPrivacyAI(PrivacyFirstAI):
     def research_topic(self, topic: str) -> Dict:
         """Research a topic and learn from it"""
         logger.info(f"🎯 Starting dedicated research on: {topic}")
-        return self.researcher.research_and_learn(topic)
+        result = self.researcher.research_and_learn(topic)
+        # The researcher writes straight to the memory store
+        self._note_external_writes(result.get("learned_items", 0))
+        return result
     
     # ===== AUTO-LEARNING METHODS =====
     
@@ -392,17 +403,21 @@ class EnhancedPrivacyAI(PrivacyFirstAI):
     
     def _store_conversation(self, user_id: str, query: str, response: Dict):
         """Store conversation for context"""
-        self.conversation_history.append({
+        entry = {
             "user_id": user_id,
             "timestamp": datetime.now(timezone.utc),
             "query": query,
             "response": response["response"],
             "confidence": response["confidence"],
             "source": response["source"]
-        })
-        
-        if len(self.conversation_history) > 20:
-            self.conversation_history.pop(0)
+        }
+        self.conversation_history.append(entry)
+        self._conversation_lines.append(orjson.dumps(entry) + b"\n")
+    
+    def get_conversation_lines(self, limit: int = 10) -> bytes:
+        """The most recent conversation entries as pre-encoded NDJSON"""
+        start = max(0, len(self._conversation_lines) - limit)
+        return b"".join(islice(self._conversation_lines, start, None))
     
     def learn_from_feedback(self, query: str, response: str, rating: int, user_comment: str = None):
         """Learn from explicit user feedback"""
@@ -420,12 +435,13 @@ class EnhancedPrivacyAI(PrivacyFirstAI):
     def get_user_profile(self, user_id: str = "default") -> Dict:
         """Get insights about the user"""
         user_conversations = [c for c in self.conversation_history if c["user_id"] == user_id]
+        last_interaction = self.user_profile["last_interaction"]
         
         return {
             "interests": list(self.user_profile["interests"]),
             "topics_discussed": list(self.user_profile["topics_discussed"]),
             "conversation_count": len(user_conversations),
-            "last_interaction": self.user_profile["last_interaction"],
+            "last_interaction": last_interaction.isoformat() if last_interaction else None,
             "conversation_style": self.user_profile["conversation_style"]
         }
     
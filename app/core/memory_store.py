@@ -1,6 +1,8 @@
 # app/core/memory_store.py
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
 import json
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 import logging
@@ -11,9 +13,37 @@ from app.core.encryption import DataEncryptor
 logger = logging.getLogger(__name__)
 encryptor = DataEncryptor()
 
+# Columns the app reads back; the embedding column is skipped because the
+# engine re-encodes every memory on load and never uses the stored vector
+MEMORY_COLUMNS = "id,input_text,output_text,context,category,confidence,created_at,is_active"
+
+# Seconds. The library default is 5, which a single add_memories() insert
+# of MAX_BULK_ITEMS rows can run past
+POSTGREST_TIMEOUT = 10
+
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+def get_client() -> Client:
+    """Process-wide Supabase client, created on first use.
+
+    Every SupabaseMemoryStore shares it, so its pooled HTTP connections are
+    reused instead of each store opening its own.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client(
+                    settings.supabase_url,
+                    settings.supabase_key,
+                    options=ClientOptions(postgrest_client_timeout=POSTGREST_TIMEOUT)
+                )
+    return _client
+
 class SupabaseMemoryStore:
     def __init__(self):
-        self.client: Client = create_client(settings.supabase_url, settings.supabase_key)
+        self.client: Client = get_client()
         self._ensure_connection()
     
     def _ensure_connection(self):
@@ -26,24 +56,29 @@ class SupabaseMemoryStore:
             logger.error(f"Supabase connection failed: {e}")
             raise
     
+    def _memory_row(self, input_text: str, output_text: str, context: str = None,
+                    category: str = "general", embedding: list = None) -> Dict:
+        """Build an encrypted memories row"""
+        # Encrypt sensitive data
+        encrypted_input = encryptor.encrypt(input_text)
+        encrypted_output = encryptor.encrypt(output_text)
+        encrypted_context = encryptor.encrypt(context) if context else None
+        
+        return {
+            "input_text": encrypted_input.decode('utf-8'),
+            "output_text": encrypted_output.decode('utf-8'),
+            "context": encrypted_context.decode('utf-8') if encrypted_context else None,
+            "category": category,
+            "embedding": json.dumps(embedding) if embedding else None,
+            "confidence": 1.0,
+            "is_active": True
+        }
+    
     def add_memory(self, input_text: str, output_text: str, context: str = None, 
                    category: str = "general", embedding: list = None) -> int:
         """Add a memory to Supabase"""
         try:
-            # Encrypt sensitive data
-            encrypted_input = encryptor.encrypt(input_text)
-            encrypted_output = encryptor.encrypt(output_text)
-            encrypted_context = encryptor.encrypt(context) if context else None
-            
-            memory_data = {
-                "input_text": encrypted_input.decode('utf-8'),
-                "output_text": encrypted_output.decode('utf-8'),
-                "context": encrypted_context.decode('utf-8') if encrypted_context else None,
-                "category": category,
-                "embedding": json.dumps(embedding) if embedding else None,
-                "confidence": 1.0,
-                "is_active": True
-            }
+            memory_data = self._memory_row(input_text, output_text, context, category, embedding)
             
             response = self.client.table('memories').insert(memory_data).execute()
             
@@ -58,15 +93,33 @@ class SupabaseMemoryStore:
             logger.error(f"Error adding memory to Supabase: {e}")
             raise
     
-    def get_active_memories(self, category: str = None, limit: int = 1000) -> List[Dict]:
-        """Get active memories from Supabase"""
+    def add_memories(self, memories: List[Dict]) -> List[int]:
+        """Add several memories to Supabase in a single insert"""
         try:
-            query = self.client.table('memories').select('*').eq('is_active', True)
+            rows = [self._memory_row(**memory) for memory in memories]
+            
+            response = self.client.table('memories').insert(rows).execute()
+            
+            if response.data:
+                memory_ids = [row['id'] for row in response.data]
+                logger.info(f"Added {len(memory_ids)} memories in one batch")
+                return memory_ids
+            else:
+                raise Exception("No data returned from Supabase")
+                
+        except Exception as e:
+            logger.error(f"Error adding memories to Supabase: {e}")
+            raise
+    
+    def get_active_memories(self, category: str = None, limit: int = 1000, offset: int = 0) -> List[Dict]:
+        """Get active memories from Supabase, newest first"""
+        try:
+            query = self.client.table('memories').select(MEMORY_COLUMNS).eq('is_active', True)
             
             if category:
                 query = query.eq('category', category)
             
-            response = query.order('created_at', desc=True).limit(limit).execute()
+            response = query.order('created_at', desc=True).range(offset, offset + limit - 1).execute()
             
             # Decrypt the data
             decrypted_memories = []
@@ -78,9 +131,8 @@ class SupabaseMemoryStore:
                         'output_text': encryptor.decrypt(memory['output_text'].encode('utf-8')),
                         'context': encryptor.decrypt(memory['context'].encode('utf-8')) if memory['context'] else None,
                         'category': memory['category'],
-                        'embedding': json.loads(memory['embedding']) if memory['embedding'] else None,
                         'confidence': memory['confidence'],
-                        'created_at': datetime.fromisoformat(memory['created_at'].replace('Z', '+00:00')),
+                        'created_at': memory['created_at'],  # already ISO-8601 from Postgres
                         'is_active': memory['is_active']
                     })
                 except Exception as e:
@@ -105,6 +157,18 @@ class SupabaseMemoryStore:
             logger.error(f"Error deleting memory {memory_id}: {e}")
             return False
     
+    def delete_memories(self, memory_ids: List[int]) -> List[int]:
+        """Soft delete several memories in one update; returns the ids that matched"""
+        try:
+            response = self.client.table('memories').update({
+                'is_active': False
+            }).in_('id', memory_ids).execute()
+            
+            return [row['id'] for row in response.data]
+        except Exception as e:
+            logger.error(f"Error deleting memories {memory_ids}: {e}")
+            return []
+    
     def add_rule(self, pattern: str, action: str, priority: int = 1) -> int:
         """Add a rule to Supabase"""
         try:
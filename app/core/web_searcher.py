@@ -1,5 +1,5 @@
 # app/core/web_searcher.py
-import requests
+import httpx
 import json
 from bs4 import BeautifulSoup
 from duckduckgo_search import DDGS
@@ -15,10 +15,21 @@ class WebSearcher:
     def __init__(self):
         self.search_cache = {}
         self.ddgs = DDGS()
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+        # One pooled HTTP/2 client shared by every page fetch, so warm
+        # connections are reused across research runs
+        self.session = httpx.Client(
+            http2=True,
+            follow_redirects=True,
+            timeout=20.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+            headers={
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            }
+        )
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        self.session.close()
     
     def search_duckduckgo(self, query: str, max_results: int = 5) -> List[Dict]:
         """Search DuckDuckGo for information"""
@@ -243,6 +254,10 @@ class AutoResearcher:
         self.ai_engine = ai_engine
         self.searcher = WebSearcher()
     
+    def close(self):
+        """Release the searcher's HTTP connections"""
+        self.searcher.close()
+    
     def _generate_search_queries(self, topic: str) -> List[str]:
         """Generate multiple search queries for better results"""
         # Common variations and corrections
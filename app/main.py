@@ -1,48 +1,45 @@
 # app/main.py
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+import msgspec
+from pydantic import BaseModel, TypeAdapter, ValidationError
 import logging
-from typing import Optional, List
+import orjson
+from contextlib import asynccontextmanager
+import time
+import zlib
+from typing import Iterable, Iterator, Optional, List, Tuple, Type
 
 from app.core.enhanced_ai_engine import EnhancedPrivacyAI
 from app.models.schemas import (
-    TeachRequest, AskRequest, RuleRequest, ResearchRequest,
-    FeedbackRequest, AskContextRequest,
+    TeachRequest, BulkTeachRequest, AskRequest, RuleRequest, ResearchRequest,
+    FeedbackRequest, AskContextRequest, BatchDeleteRequest,
     AIResponse, HealthResponse, PerformanceResponse,
-    UserProfileResponse, ConversationHistoryResponse
+    UserProfileResponse, MemoryResponse, ConversationEntry, AIResponseStruct, HealthResponseStruct,
+    TEACH_REQUEST_ADAPTER, TEACH_LIST_ADAPTER, ASK_REQUEST_ADAPTER,
+    ASK_CONTEXT_REQUEST_ADAPTER, RULE_REQUEST_ADAPTER
 )
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize FastAPI app
-app = FastAPI(
-    title="Privacy-First AI API",
-    description="Fully offline, privacy-first AI assistant with web research and comprehensive auto-learning capabilities",
-    version="2.3.0",
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
+# Enhanced AI engine, created in lifespan() so a reload cycle releases the
+# previous instance (and its model) before building a new one
+ai_engine: Optional[EnhancedPrivacyAI] = None
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production, restrict this to your frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Initialize enhanced AI engine
-ai_engine = EnhancedPrivacyAI()
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize the AI engine on startup"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the AI engine on startup and clean it up on shutdown"""
+    global ai_engine
     logger.info("🚀 Enhanced Privacy-First AI starting up...")
     try:
+        ai_engine = EnhancedPrivacyAI()
+        
         # Health check to ensure everything is loaded
         health = ai_engine.get_health()
         logger.info(f"✅ AI Engine initialized successfully")
@@ -64,18 +61,150 @@ async def startup_event():
     except Exception as e:
         logger.error(f"❌ Startup failed: {e}")
         raise
+    
+    try:
+        yield
+    finally:
+        logger.info("🛑 Enhanced Privacy-First AI shutting down...")
+        # Stop auto-learning gracefully
+        ai_engine.disable_auto_learning()
+        ai_engine.researcher.close()
+        ai_engine = None
+
+# Initialize FastAPI app
+app = FastAPI(
+    lifespan=lifespan,
+    title="Privacy-First AI API",
+    description="Fully offline, privacy-first AI assistant with web research and comprehensive auto-learning capabilities",
+    version="2.3.0",
+    docs_url="/docs",
+    redoc_url="/redoc"
+)
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    logger.info("🛑 Enhanced Privacy-First AI shutting down...")
-    # Stop auto-learning gracefully
-    ai_engine.disable_auto_learning()
+# Probe/landing paths that browsers never call cross-origin
+CORS_EXEMPT_PATHS = frozenset({"/health", "/metrics", "/"})
+
+class ScopedCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware that passes CORS_EXEMPT_PATHS straight through"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in CORS_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# CORS middleware
+app.add_middleware(
+    ScopedCORSMiddleware,
+    allow_origins=["*"],  # In production, restrict this to your frontend URL
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Tiny probe responses aren't worth compressing
+GZIP_EXEMPT_PATHS = frozenset({"/health", "/ask-stream"})  # gzip would buffer the SSE stream
+
+class ScopedGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that passes GZIP_EXEMPT_PATHS straight through"""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in GZIP_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress large JSON bodies (/stats, /memories, /conversation-history, /)
+app.add_middleware(ScopedGZipMiddleware, minimum_size=1024, compresslevel=5)
+
+def _body_errors(e: ValidationError, *prefix) -> list:
+    """Pydantic errors with FastAPI's ("body", ...) loc prefix, as declared bodies report them"""
+    return [{**err, "loc": ("body", *prefix, *err["loc"])} for err in e.errors(include_url=False)]
+
+async def _parse_body(raw_request: Request, adapter: TypeAdapter):
+    """Validate a raw JSON request body with a prebuilt TypeAdapter"""
+    body = await raw_request.body()
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(_body_errors(e), body=body)
+
+async def _parse_items(raw_request: Request, adapter: TypeAdapter) -> list:
+    """Validate the "items" array of a raw JSON batch body with a prebuilt TypeAdapter"""
+    body = await raw_request.body()
+    try:
+        items = orjson.loads(body)["items"]
+    except (ValueError, KeyError, TypeError):
+        raise RequestValidationError(
+            [{"type": "missing", "loc": ("body", "items"), "msg": "Expected a JSON object with an items array", "input": None}],
+            body=body
+        )
+    try:
+        return adapter.validate_python(items)
+    except ValidationError as e:
+        raise RequestValidationError(_body_errors(e, "items"), body=body)
+
+# Last encoded health body, its ETag and when it was taken; liveness probes
+# and bulk imports poll /health far more often than the numbers change
+HEALTH_CACHE_TTL = 1.0
+_health_cache = {"timestamp": float("-inf"), "body": b"", "etag": ""}
+
+def _cached_health() -> Tuple[bytes, str]:
+    """Return the encoded health body and its ETag, rebuilt at most once per HEALTH_CACHE_TTL"""
+    now = time.monotonic()
+    if now - _health_cache["timestamp"] >= HEALTH_CACHE_TTL:
+        health = msgspec.convert(ai_engine.get_health(), HealthResponseStruct)
+        body = msgspec.json.encode(health)
+        _health_cache["body"] = body
+        _health_cache["etag"] = f'"{zlib.crc32(body):08x}"'
+        _health_cache["timestamp"] = now
+    return _health_cache["body"], _health_cache["etag"]
+
+def _ndjson_lines(rows: Iterable[dict]) -> Iterator[bytes]:
+    """Encode rows one at a time as newline-delimited JSON"""
+    for row in rows:
+        yield orjson.dumps(row) + b"\n"
+
+# A word plus the whitespace after it, so streamed deltas rejoin exactly
+def _sse_answer(answer: AIResponseStruct) -> Iterator[bytes]:
+    """Server-sent events: the answer text, then a final metadata event"""
+    yield b"data: " + orjson.dumps({"delta": answer.response}) + b"\n\n"
+    metadata = msgspec.structs.asdict(answer)
+    del metadata["response"]
+    metadata["final"] = True
+    yield b"data: " + orjson.dumps(metadata) + b"\n\n"
+
+def _struct_response(data: dict, struct_type: Type[msgspec.Struct]) -> Response:
+    """Encode an engine dict through its msgspec struct, bypassing response_model"""
+    return Response(
+        content=msgspec.json.encode(msgspec.convert(data, struct_type)),
+        media_type="application/json"
+    )
+
+def _body_schema(model: Type[BaseModel]) -> dict:
+    """OpenAPI request body for endpoints that parse their own body"""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        }
+    }
+
+def _ndjson_response(line_type, description: str) -> dict:
+    """OpenAPI 200 response for endpoints that stream one JSON object per line"""
+    return {
+        200: {
+            "description": description,
+            "content": {
+                "application/x-ndjson": {"schema": TypeAdapter(line_type).json_schema(mode="serialization")}
+            }
+        }
+    }
 
 # ===== CORE AI ENDPOINTS =====
 
-@app.post("/teach", response_model=dict)
-async def teach_endpoint(request: TeachRequest):
+@app.post("/teach", response_model=dict, openapi_extra=_body_schema(TeachRequest))
+async def teach_endpoint(raw_request: Request):
     """
     Teach the AI new knowledge
     
@@ -84,6 +213,7 @@ async def teach_endpoint(request: TeachRequest):
     - **context**: Optional context for the memory
     - **category**: Category for organization
     """
+    request = await _parse_body(raw_request, TEACH_REQUEST_ADAPTER)
     try:
         logger.info(f"📚 Teaching new memory: {request.input_text[:50]}...")
         
@@ -104,21 +234,47 @@ async def teach_endpoint(request: TeachRequest):
             detail=f"Teaching failed: {str(e)}"
         )
 
-@app.post("/ask", response_model=AIResponse)
-async def ask_endpoint(request: AskRequest):
+@app.post("/teach/bulk", response_model=dict, openapi_extra=_body_schema(BulkTeachRequest))
+async def teach_bulk_endpoint(raw_request: Request):
+    """
+    Teach the AI many memories in one request
+    
+    - **items**: List of memories, each with the same fields as /teach
+    """
+    items = await _parse_items(raw_request, TEACH_LIST_ADAPTER)
+    try:
+        logger.info(f"📚 Bulk teaching {len(items)} memories...")
+        
+        result = await run_in_threadpool(
+            ai_engine.teach_bulk, [item.model_dump() for item in items]
+        )
+        
+        logger.info(f"✅ Bulk teach finished: {result.get('learned', 0)} learned, {result.get('duplicates', 0)} duplicates")
+        return result
+        
+    except Exception as e:
+        logger.error(f"❌ Error in /teach/bulk: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Bulk teaching failed: {str(e)}"
+        )
+
+@app.post("/ask", response_model=AIResponse, openapi_extra=_body_schema(AskRequest))
+async def ask_endpoint(raw_request: Request):
     """
     Query the AI based on learned knowledge
     
     - **query**: The question to ask
     - **threshold**: Similarity threshold (0.0-1.0)
     """
+    request = await _parse_body(raw_request, ASK_REQUEST_ADAPTER)
     try:
         logger.info(f"🤔 Asking: {request.query[:50]}...")
         
         response = ai_engine.ask(request.query, request.threshold)
         
         logger.info(f"✅ Response confidence: {response['confidence']:.2f}, source: {response['source']}")
-        return AIResponse(**response)
+        return _struct_response(response, AIResponseStruct)
         
     except Exception as e:
         logger.error(f"❌ Error in /ask: {e}")
@@ -127,8 +283,8 @@ async def ask_endpoint(request: AskRequest):
             detail=f"Query failed: {str(e)}"
         )
 
-@app.post("/rules", response_model=dict)
-async def add_rule_endpoint(request: RuleRequest):
+@app.post("/rules", response_model=dict, openapi_extra=_body_schema(RuleRequest))
+async def add_rule_endpoint(raw_request: Request):
     """
     Add a behavior rule
     
@@ -136,6 +292,7 @@ async def add_rule_endpoint(request: RuleRequest):
     - **action**: Response when pattern matches
     - **priority**: Rule priority (1-10)
     """
+    request = await _parse_body(raw_request, RULE_REQUEST_ADAPTER)
     try:
         logger.info(f"📝 Adding rule: {request.pattern[:50]}...")
         
@@ -157,8 +314,8 @@ async def add_rule_endpoint(request: RuleRequest):
 
 # ===== ENHANCED ENDPOINTS =====
 
-@app.post("/ask-context", response_model=AIResponse)
-async def ask_with_context_endpoint(request: AskContextRequest):
+@app.post("/ask-context", response_model=AIResponse, openapi_extra=_body_schema(AskContextRequest))
+async def ask_with_context_endpoint(raw_request: Request):
     """
     Ask with conversation context and optional web research
     
@@ -167,6 +324,7 @@ async def ask_with_context_endpoint(request: AskContextRequest):
     - **threshold**: Similarity threshold (0.0-1.0) 
     - **enable_research**: Whether to search online for unknown topics
     """
+    request = await _parse_body(raw_request, ASK_CONTEXT_REQUEST_ADAPTER)
     try:
         logger.info(f"🧠 Contextual ask from {request.user_id}: {request.query[:50]}...")
         logger.info(f"🔍 Research enabled: {request.enable_research}")
@@ -181,7 +339,7 @@ async def ask_with_context_endpoint(request: AskContextRequest):
         enhancement = response.get('enhancement', 'none')
         logger.info(f"✅ Response enhanced with: {enhancement}, confidence: {response['confidence']:.2f}")
         
-        return AIResponse(**response)
+        return _struct_response(response, AIResponseStruct)
         
     except Exception as e:
         logger.error(f"❌ Error in /ask-context: {e}")
@@ -190,6 +348,40 @@ async def ask_with_context_endpoint(request: AskContextRequest):
             detail=f"Contextual query failed: {str(e)}"
         )
 
+@app.post("/ask-stream", response_class=StreamingResponse, openapi_extra=_body_schema(AskContextRequest))
+async def ask_stream_endpoint(raw_request: Request):
+    """
+    Same as /ask-context, but streams the answer as server-sent events
+    
+    Text arrives as `data: {"delta": "..."}` events to be concatenated;
+    the last event is `data: {"final": true, ...}` carrying the confidence,
+    source and enhancement fields of /ask-context. The engine builds the
+    answer in one go, so today the text comes in a single delta.
+    """
+    request = await _parse_body(raw_request, ASK_CONTEXT_REQUEST_ADAPTER)
+    try:
+        logger.info(f"🧠 Streaming ask from {request.user_id}: {request.query[:50]}...")
+        
+        response = ai_engine.ask_with_context(
+            query=request.query, 
+            user_id=request.user_id, 
+            threshold=request.threshold, 
+            enable_research=request.enable_research
+        )
+        
+        return StreamingResponse(
+            _sse_answer(msgspec.convert(response, AIResponseStruct)),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+        
+    except Exception as e:
+        logger.error(f"❌ Error in /ask-stream: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Streaming ask failed: {str(e)}"
+        )
+
 @app.post("/research", response_model=dict)
 async def research_endpoint(request: ResearchRequest):
     """
@@ -201,7 +393,8 @@ async def research_endpoint(request: ResearchRequest):
     try:
         logger.info(f"🔬 Researching topic: {request.topic}")
         
-        result = ai_engine.research_topic(request.topic)
+        # Research is network-bound; keep it off the event loop
+        result = await run_in_threadpool(ai_engine.research_topic, request.topic)
         
         if result["status"] == "success":
             logger.info(f"✅ Research successful: {result['learned_items']} items learned")
@@ -361,7 +554,7 @@ async def research_topic_now_endpoint(topic: str):
     try:
         logger.info(f"🎯 Immediate research requested for: {topic}")
         
-        result = ai_engine.research_topic_now(topic)
+        result = await run_in_threadpool(ai_engine.research_topic_now, topic)
         
         if result["status"] == "success":
             logger.info(f"✅ Immediate research successful: {result['learned_items']} items learned")
@@ -456,24 +649,30 @@ async def submit_feedback_endpoint(request: FeedbackRequest):
 
 # ===== DATA MANAGEMENT ENDPOINTS =====
 
-@app.get("/memories", response_model=list)
+@app.get(
+    "/memories",
+    response_class=StreamingResponse,
+    responses=_ndjson_response(MemoryResponse, "One memory per line, newest first")
+)
 async def get_memories_endpoint(
     category: Optional[str] = None, 
-    limit: int = 100
+    limit: int = 100,
+    offset: int = 0
 ):
     """
-    Get memories with optional filtering
+    Get memories with optional filtering, streamed as newline-delimited JSON
     
     - **category**: Filter by category
     - **limit**: Maximum number of memories to return
+    - **offset**: Number of newest memories to skip, for paging
     """
     try:
-        logger.info(f"📖 Fetching memories (category: {category}, limit: {limit})")
+        logger.info(f"📖 Fetching memories (category: {category}, limit: {limit}, offset: {offset})")
         
-        memories = ai_engine.get_memories(category, limit)
+        memories = ai_engine.get_memories(category, limit, offset)
         
         logger.info(f"✅ Retrieved {len(memories)} memories")
-        return memories
+        return StreamingResponse(_ndjson_lines(memories), media_type="application/x-ndjson")
         
     except Exception as e:
         logger.error(f"❌ Error in /memories: {e}")
@@ -482,6 +681,32 @@ async def get_memories_endpoint(
             detail=f"Failed to retrieve memories: {str(e)}"
         )
 
+@app.post("/memories/batch-delete", response_model=dict)
+async def batch_delete_memories_endpoint(request: BatchDeleteRequest):
+    """
+    Delete several memories in one request
+    
+    - **ids**: IDs of the memories to delete
+    """
+    try:
+        logger.info(f"🗑️ Deleting {len(request.ids)} memories...")
+        
+        result = ai_engine.delete_memories(request.ids)
+        
+        if result["status"] == "deleted":
+            logger.info(f"✅ Deleted {len(result['memory_ids'])} memories, {len(result['not_found'])} not found")
+        else:
+            logger.warning(f"⚠️ Batch deletion failed: {result.get('message')}")
+        
+        return result
+        
+    except Exception as e:
+        logger.error(f"❌ Error deleting memories: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to delete memories: {str(e)}"
+        )
+
 @app.delete("/memories/{memory_id}", response_model=dict)
 async def delete_memory_endpoint(memory_id: int):
     """
@@ -510,13 +735,19 @@ async def delete_memory_endpoint(memory_id: int):
 
 # ===== SYSTEM & MONITORING ENDPOINTS =====
 
+@app.head("/health", include_in_schema=False)
+async def health_probe():
+    """Answer liveness probes without building the health body"""
+    return PlainTextResponse("ok")
+
 @app.get("/health", response_model=HealthResponse)
-async def health_check():
+async def health_check(request: Request):
     """Get system health information"""
     try:
-        health = ai_engine.get_health()
-        logger.debug(f"Health check: {health['status']}")
-        return HealthResponse(**health)
+        body, etag = _cached_health()
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
         
     except Exception as e:
         logger.error(f"❌ Health check failed: {e}")
@@ -531,7 +762,7 @@ async def performance_stats():
     try:
         stats = ai_engine.get_performance_stats()
         logger.debug("Performance stats retrieved")
-        return PerformanceResponse(**stats)
+        return PerformanceResponse.model_construct(**stats)
         
     except Exception as e:
         logger.error(f"❌ Error getting performance stats: {e}")
@@ -543,19 +774,25 @@ async def get_user_profile(user_id: str = "default"):
     try:
         profile = ai_engine.get_user_profile(user_id)
         logger.info(f"📊 User profile retrieved for {user_id}")
-        return UserProfileResponse(**profile)
+        return UserProfileResponse.model_construct(**profile)
         
     except Exception as e:
         logger.error(f"❌ Error getting user profile: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/conversation-history", response_model=ConversationHistoryResponse)
+@app.get(
+    "/conversation-history",
+    response_class=Response,
+    responses=_ndjson_response(ConversationEntry, "One conversation entry per line, oldest first")
+)
 async def get_conversation_history(limit: int = 10):
-    """Get recent conversation history"""
+    """Get recent conversation history as newline-delimited JSON"""
     try:
-        history = ai_engine.conversation_history[-limit:]
-        logger.info(f"💬 Retrieved {len(history)} conversation entries")
-        return ConversationHistoryResponse(conversations=history)
+        # Entries were encoded when stored, so this is a single join
+        body = ai_engine.get_conversation_lines(limit)
+        entries = body.count(b"\n")
+        logger.info(f"💬 Retrieved {entries} conversation entries")
+        return Response(content=body, media_type="application/x-ndjson")
         
     except Exception as e:
         logger.error(f"❌ Error getting conversation history: {e}")
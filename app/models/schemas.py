@@ -1,66 +1,133 @@
 # app/models/schemas.py
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Optional, List, Dict, Any, Literal
+from typing_extensions import Annotated, TypedDict  # pydantic needs this TypedDict before 3.12
 from datetime import datetime
 
+# Shared by every request model: reject unknown keys, no whitespace stripping
+REQUEST_MODEL_CONFIG = ConfigDict(
+    extra='forbid', str_strip_whitespace=False, validate_assignment=False, frozen=False
+)
+
+MAX_TEXT_LENGTH = 1000
+MAX_OUTPUT_LENGTH = 2000
+MAX_SHORT_TEXT_LENGTH = 500
+MAX_CATEGORY_LENGTH = 50
+MAX_BULK_ITEMS = 1000
+
+# Descriptions shared by several models
+DESC_SOURCES = "Sources used for research"
+DESC_PENDING_UPDATES = "Number of pending knowledge base updates"
+
+def ScoreField(default: Any, description: str) -> Any:
+    """Field for a 0.0-1.0 score"""
+    return Field(default, ge=0.0, le=1.0, description=description)
+
+ResponseSource = Literal["memory", "rule", "web_research", "unknown", "error"]
+Enhancement = Literal["common_sense", "personalization", "context", "web_research"]
+ResearchStatus = Literal["success", "no_results", "error"]
+ResearchDepth = Literal["basic", "comprehensive"]
+
 class TeachRequest(BaseModel):
-    input_text: str = Field(..., min_length=1, max_length=1000, description="The question or input pattern")
-    output_text: str = Field(..., min_length=1, max_length=2000, description="The desired response")
-    context: Optional[str] = Field(None, max_length=1000, description="Optional context for the memory")
-    category: str = Field("general", max_length=50, description="Category for organization")
+    model_config = REQUEST_MODEL_CONFIG
+
+    input_text: str = Field(..., min_length=1, max_length=MAX_TEXT_LENGTH, description="The question or input pattern")
+    output_text: str = Field(..., min_length=1, max_length=MAX_OUTPUT_LENGTH, description="The desired response")
+    context: Optional[str] = Field(None, max_length=MAX_TEXT_LENGTH, description="Optional context for the memory")
+    category: str = Field("general", max_length=MAX_CATEGORY_LENGTH, description="Category for organization")
+
+class BulkTeachRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
+    items: List[TeachRequest] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS, description="Memories to teach in one batch")
 
 class AskRequest(BaseModel):
-    query: str = Field(..., min_length=1, max_length=1000, description="The question to ask")
-    threshold: float = Field(0.7, ge=0.0, le=1.0, description="Similarity threshold (0.0-1.0)")
+    model_config = REQUEST_MODEL_CONFIG
 
-class AskContextRequest(BaseModel):
-    query: str = Field(..., min_length=1, max_length=1000)
+    query: str = Field(..., min_length=1, max_length=MAX_TEXT_LENGTH, description="The question to ask")
+    threshold: float = ScoreField(0.7, "Similarity threshold (0.0-1.0)")
+
+class AskContextRequest(AskRequest):
+    # query and threshold (and the config) come from AskRequest
     user_id: str = Field("default", description="User identifier for conversation tracking")
-    threshold: float = Field(0.7, ge=0.0, le=1.0)
     enable_research: bool = Field(False, description="Whether to search online for unknown topics")
 
 class RuleRequest(BaseModel):
-    pattern: str = Field(..., min_length=1, max_length=500, description="Text pattern to match")
-    action: str = Field(..., min_length=1, max_length=1000, description="Response when pattern matches")
+    model_config = REQUEST_MODEL_CONFIG
+
+    pattern: str = Field(..., min_length=1, max_length=MAX_SHORT_TEXT_LENGTH, description="Text pattern to match")
+    action: str = Field(..., min_length=1, max_length=MAX_TEXT_LENGTH, description="Response when pattern matches")
     priority: int = Field(1, ge=1, le=10, description="Rule priority (1-10)")
 
 class ResearchRequest(BaseModel):
-    topic: str = Field(..., min_length=1, max_length=500, description="Topic to research online")
-    depth: str = Field("basic", description="Research depth: basic or comprehensive")
+    model_config = REQUEST_MODEL_CONFIG
+
+    topic: str = Field(..., min_length=1, max_length=MAX_SHORT_TEXT_LENGTH, description="Topic to research online")
+    depth: ResearchDepth = Field("basic", description="Research depth: basic or comprehensive")
+
+class BatchDeleteRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS, description="IDs of the memories to delete")
 
 class FeedbackRequest(BaseModel):
+    model_config = REQUEST_MODEL_CONFIG
+
     query: str = Field(..., description="Original user query")
     response: str = Field(..., description="AI response that was given")
     rating: int = Field(..., ge=1, le=5, description="Rating 1-5 (1=bad, 5=excellent)")
     comment: Optional[str] = Field(None, description="Optional comment explaining the rating")
 
+# Validators for endpoints that parse their own body, built once at import;
+# constructing a TypeAdapter costs far more than one validation
+TEACH_REQUEST_ADAPTER: TypeAdapter[TeachRequest] = TypeAdapter(TeachRequest)
+TEACH_LIST_ADAPTER: TypeAdapter[List[TeachRequest]] = TypeAdapter(
+    Annotated[List[TeachRequest], Field(min_length=1, max_length=MAX_BULK_ITEMS)]
+)
+ASK_REQUEST_ADAPTER: TypeAdapter[AskRequest] = TypeAdapter(AskRequest)
+ASK_CONTEXT_REQUEST_ADAPTER: TypeAdapter[AskContextRequest] = TypeAdapter(AskContextRequest)
+RULE_REQUEST_ADAPTER: TypeAdapter[RuleRequest] = TypeAdapter(RuleRequest)
+
 # ===== RESPONSE MODELS =====
 
+# One line of the /conversation-history NDJSON stream
+class ConversationEntry(TypedDict):
+    user_id: str
+    timestamp: datetime
+    query: str
+    response: str
+    confidence: float
+    source: str
+
+# OpenAPI description of AIResponseStruct, which handlers encode directly.
 class AIResponse(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True, validate_assignment=False)
+
     response: str = Field(..., description="The AI's response")
-    confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence score of the response")
-    source: str = Field(..., description="Source of the response: memory, rule, web_research, unknown")
+    confidence: float = ScoreField(..., "Confidence score of the response")
+    source: ResponseSource = Field(..., description="Source of the response: memory, rule, web_research, unknown, error")
     memory_id: Optional[int] = Field(None, description="ID of the memory used, if applicable")
     rule_id: Optional[int] = Field(None, description="ID of the rule used, if applicable")
     match_rank: Optional[int] = Field(None, description="Rank of the match if multiple were considered")
-    enhancement: Optional[str] = Field(None, description="Type of enhancement applied: common_sense, personalization, context, web_research")
+    enhancement: Optional[Enhancement] = Field(None, description="Type of enhancement applied: common_sense, personalization, context, web_research")
     research_used: Optional[bool] = Field(None, description="Whether web research was used")
-    sources: Optional[List[str]] = Field(None, description="Sources used for research")
+    sources: Optional[List[str]] = Field(None, description=DESC_SOURCES)
 
 class TeachResponse(BaseModel):
     status: str = Field(..., description="Status of the teaching operation")
     memory_id: int = Field(..., description="ID of the created memory")
     category: str = Field(..., description="Category of the memory")
-    pending_updates: Optional[int] = Field(None, description="Number of pending knowledge base updates")
+    pending_updates: Optional[int] = Field(None, description=DESC_PENDING_UPDATES)
 
 class RuleResponse(BaseModel):
     status: str = Field(..., description="Status of the rule operation")
     rule_id: int = Field(..., description="ID of the created rule")
 
 class ResearchResponse(BaseModel):
-    status: str = Field(..., description="Status of the research: success, no_results, error")
+    status: ResearchStatus = Field(..., description="Status of the research: success, no_results, error")
     learned_items: int = Field(..., description="Number of items learned from research")
-    sources: List[str] = Field(..., description="Sources used for research")
+    sources: List[str] = Field(..., description=DESC_SOURCES)
     message: str = Field(..., description="Human-readable result message")
 
 class FeedbackResponse(BaseModel):
@@ -68,16 +135,23 @@ class FeedbackResponse(BaseModel):
     message: str = Field(..., description="Acknowledgement message")
     rating_received: int = Field(..., description="The rating that was received")
 
+# OpenAPI description of HealthResponseStruct, which handlers encode directly.
 class HealthResponse(BaseModel):
+    model_config = ConfigDict(
+        extra='ignore', frozen=True, validate_assignment=False,
+        protected_namespaces=()  # model_loaded is a field, not pydantic API
+    )
+
     status: str = Field(..., description="Overall system health status")
     memory_count: int = Field(..., description="Number of active memories")
     rule_count: int = Field(..., description="Number of active rules")
     model_loaded: bool = Field(..., description="Whether the AI model is loaded")
     knowledge_base_ready: bool = Field(..., description="Whether the knowledge base is ready")
     cache_size: int = Field(..., description="Number of items in memory cache")
-    pending_updates: int = Field(..., description="Number of pending knowledge base updates")
+    pending_updates: int = Field(..., description=DESC_PENDING_UPDATES)
     last_update: str = Field(..., description="Timestamp of last knowledge base update")
 
+# Constructed via model_construct in handlers; do not call on untrusted input.
 class PerformanceResponse(BaseModel):
     memory_cache_size: int = Field(..., description="Number of memories in cache")
     embedding_cache_size: int = Field(..., description="Size of embedding cache")
@@ -89,6 +163,7 @@ class PerformanceResponse(BaseModel):
     successful_responses: int = Field(..., description="Number of successful responses tracked")
     total_feedback_ratings: int = Field(..., description="Total number of feedback ratings received")
 
+# Constructed via model_construct in handlers; do not call on untrusted input.
 class UserProfileResponse(BaseModel):
     interests: List[str] = Field(..., description="User's learned interests")
     topics_discussed: List[str] = Field(..., description="Topics discussed with the user")
@@ -96,9 +171,6 @@ class UserProfileResponse(BaseModel):
     last_interaction: Optional[str] = Field(None, description="Timestamp of last interaction")
     conversation_style: str = Field(..., description="Detected conversation style")
 
-class ConversationHistoryResponse(BaseModel):
-    conversations: List[Dict[str, Any]] = Field(..., description="List of conversation entries")
-
 class MemoryResponse(BaseModel):
     id: int = Field(..., description="Memory ID")
     input_text: str = Field(..., description="Input text/question")
@@ -106,7 +178,7 @@ class MemoryResponse(BaseModel):
     context: Optional[str] = Field(None, description="Context for the memory")
     category: str = Field(..., description="Memory category")
     confidence: float = Field(..., description="Confidence score")
-    created_at: datetime = Field(..., description="Creation timestamp")
+    created_at: str = Field(..., description="ISO-8601 creation timestamp")
     is_active: bool = Field(..., description="Whether the memory is active")
 
 class ForceUpdateResponse(BaseModel):
@@ -136,4 +208,31 @@ class RootResponse(BaseModel):
     features: List[str] = Field(..., description="Available features")
     endpoints: Dict[str, str] = Field(..., description="Available endpoints")
     documentation: str = Field(..., description="Documentation URL")
-    notice: str = Field(..., description="Privacy notice")
\ No newline at end of file
+    notice: str = Field(..., description="Privacy notice")
+
+# ===== WIRE STRUCTS =====
+# msgspec mirrors of the hottest response models; encoding these skips
+# pydantic-core entirely. Structs are slotted, and gc=False is safe because
+# they only hold scalars and lists of str. Keep the fields in step with the
+# models above.
+
+class AIResponseStruct(msgspec.Struct, frozen=True, gc=False):
+    response: str
+    confidence: float
+    source: ResponseSource
+    memory_id: Optional[int] = None
+    rule_id: Optional[int] = None
+    match_rank: Optional[int] = None
+    enhancement: Optional[Enhancement] = None
+    research_used: Optional[bool] = None
+    sources: Optional[List[str]] = None
+
+class HealthResponseStruct(msgspec.Struct, frozen=True, gc=False):
+    status: str
+    memory_count: int
+    rule_count: int
+    model_loaded: bool
+    knowledge_base_ready: bool
+    cache_size: int
+    pending_updates: int
+    last_update: str
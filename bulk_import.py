@@ -1,12 +1,92 @@
 # bulk_import.py
+import asyncio
+import httpx
 import requests
-import json
+import orjson
 import time
+from tqdm import tqdm
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import uvloop
+except ImportError:  # optional; asyncio's default loop works too
+    uvloop = None
 
 BASE_URL = "http://localhost:8000"
 
+# Pooled keep-alive session for the one-shot server check
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=1,
+    max_retries=Retry(total=3, backoff_factor=0.1)
+))
+SESSION.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# In-flight /teach requests for the per-item fallback
+MAX_CONCURRENCY = 16
+
+class AdaptiveThrottle:
+    """Send spacing that backs off on 429/5xx and decays back to zero on success"""
+    
+    def __init__(self):
+        self.next_send_ts = 0.0
+        self.interval = 0.0
+    
+    def reserve(self):
+        """Claim the next send slot; returns how many seconds to wait for it"""
+        now = time.monotonic()
+        delay = self.next_send_ts - now
+        self.next_send_ts = max(now, self.next_send_ts) + self.interval
+        return max(delay, 0.0)
+    
+    def record(self, status_code):
+        """Adjust the spacing after a response"""
+        if status_code == 429 or status_code >= 500:
+            self.interval = min(self.interval * 2 + 0.05, 1.0)
+        else:
+            self.interval = max(self.interval * 0.9, 0.0)
+
+THROTTLE = AdaptiveThrottle()
+
+async def post_one(client, semaphore, item):
+    """Teach a single memory through /teach"""
+    async with semaphore:
+        await asyncio.sleep(THROTTLE.reserve())
+        response = await client.post("/teach", content=orjson.dumps(item), headers=JSON_HEADERS)
+        THROTTLE.record(response.status_code)
+        return item, response
+
+async def import_items_concurrently(client, items):
+    """Per-item import for servers without /teach/bulk; returns (successes, errors)"""
+    success_count = 0
+    error_count = 0
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    
+    tasks = [asyncio.ensure_future(post_one(client, semaphore, item)) for item in items]
+    # One progress bar instead of a print per item; only errors get a line
+    for next_done in tqdm(asyncio.as_completed(tasks), total=len(items), unit="mem"):
+        try:
+            item, response = await next_done
+            if response.status_code == 200:
+                success_count += 1
+            else:
+                tqdm.write(f"❌ {item['input_text'][:45]}: Failed - {response.text}")
+                error_count += 1
+        except httpx.TimeoutException:
+            tqdm.write("❌ Request timeout")
+            error_count += 1
+        except Exception as e:
+            tqdm.write(f"❌ Error - {e}")
+            error_count += 1
+    
+    return success_count, error_count
+
 # Your updated data
-data = [
+DATA = (
     {
         "input_text": "How do you juggle coding, hackathons, and college?",
         "output_text": "Barely, bro 😂. It's all sprints and caffeine. Prioritize the fire projects, let the small stuff slide.",
@@ -97,72 +177,76 @@ data = [
         "context": "Balancing structured work with creative output.",
         "category": "personal_growth"
     }
-]
+)
+
+# The batch body never changes between runs, so encode it once
+PAYLOAD = orjson.dumps({"items": DATA})
 
-def import_data():
+async def import_data():
     print("🚀 Starting bulk import...")
-    print(f"📦 Importing {len(data)} memories into your AI...")
+    print(f"📦 Importing {len(DATA)} memories into your AI...")
     success_count = 0
+    duplicate_count = 0
     error_count = 0
     
-    for i, item in enumerate(data, 1):
+    # http2=True only takes effect over TLS; uvicorn serves plain HTTP/1.1
+    async with httpx.AsyncClient(base_url=BASE_URL, http2=True, timeout=10) as client:
         try:
-            response = requests.post(
-                f"{BASE_URL}/teach",
-                json={
-                    "input_text": item["input_text"],
-                    "output_text": item["output_text"],
-                    "context": item["context"],
-                    "category": item["category"]
-                },
-                timeout=10  # 10 second timeout
+            # One batched request instead of a POST per memory
+            response = await client.post(
+                "/teach/bulk",
+                content=PAYLOAD,
+                headers=JSON_HEADERS,
+                timeout=60  # the server embeds the whole batch at once
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                print(f"✅ {i:2d}/{len(data)}: {item['category']:20} - {item['input_text'][:45]}...")
-                success_count += 1
+            if response.status_code == 404:
+                # Older server without the batch endpoint
+                print("⚠️  /teach/bulk not available, importing items concurrently...")
+                success_count, error_count = await import_items_concurrently(client, DATA)
             else:
-                print(f"❌ {i:2d}/{len(data)}: Failed - {response.text}")
-                error_count += 1
+                result = orjson.loads(response.content) if response.status_code == 200 else {}
+                if result.get("status") == "learned":
+                    success_count = result["learned"]
+                    duplicate_count = result["duplicates"]
+                else:
+                    print(f"❌ Bulk import failed - {result.get('message') or response.text}")
+                    error_count = len(DATA)
             
-            # Small delay to not overwhelm the server
-            time.sleep(0.2)
-            
-        except requests.exceptions.ConnectionError:
-            print(f"❌ {i:2d}/{len(data)}: Cannot connect to server. Is it running?")
-            error_count += 1
-            break
-        except requests.exceptions.Timeout:
-            print(f"❌ {i:2d}/{len(data)}: Request timeout")
-            error_count += 1
+        except httpx.ConnectError:
+            print("❌ Cannot connect to server. Is it running?")
+            error_count = len(DATA)
+        except httpx.TimeoutException:
+            print("❌ Request timeout")
+            error_count = len(DATA)
         except Exception as e:
-            print(f"❌ {i:2d}/{len(data)}: Error - {e}")
-            error_count += 1
-    
-    print(f"\n🎉 Import complete!")
-    print(f"✅ Successfully imported: {success_count}")
-    print(f"❌ Errors: {error_count}")
-    
-    # Show final stats
-    try:
-        health_response = requests.get(f"{BASE_URL}/health", timeout=5)
-        if health_response.status_code == 200:
-            health = health_response.json()
-            print(f"\n📊 Final AI Stats:")
-            print(f"   Memories: {health['memory_count']}")
-            print(f"   Rules: {health['rule_count']}")
-            print(f"   Model Loaded: {health['model_loaded']}")
-            print(f"   Knowledge Base Ready: {health['knowledge_base_ready']}")
-    except:
-        print("\n⚠️  Could not fetch final stats - server might be busy")
+            print(f"❌ Error - {e}")
+            error_count = len(DATA)
+        
+        print(f"\n🎉 Import complete!")
+        print(f"✅ Successfully imported: {success_count}")
+        print(f"♻️  Skipped duplicates: {duplicate_count}")
+        print(f"❌ Errors: {error_count}")
+        
+        # Show final stats
+        try:
+            health_response = await client.get("/health", timeout=5)
+            if health_response.status_code == 200:
+                health = orjson.loads(health_response.content)
+                print(f"\n📊 Final AI Stats:")
+                print(f"   Memories: {health['memory_count']}")
+                print(f"   Rules: {health['rule_count']}")
+                print(f"   Model Loaded: {health['model_loaded']}")
+                print(f"   Knowledge Base Ready: {health['knowledge_base_ready']}")
+        except:
+            print("\n⚠️  Could not fetch final stats - server might be busy")
 
 def check_server():
     """Check if server is running"""
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/health", timeout=5)
         if response.status_code == 200:
-            health = response.json()
+            health = orjson.loads(response.content)
             print(f"✅ Server is running! Current stats:")
             print(f"   Memories: {health['memory_count']}")
             print(f"   Rules: {health['rule_count']}")
@@ -185,7 +269,9 @@ if __name__ == "__main__":
     # Check if server is running first
     if check_server():
         print("\n" + "=" * 60)
-        import_data()
+        if uvloop is not None:
+            uvloop.install()
+        asyncio.run(import_data())
         
         print("\n🎪 Your AI is now trained with hackathon energy! Try asking:")
         print("   - 'How do you juggle coding, hackathons, and college?'")
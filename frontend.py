@@ -1,9 +1,15 @@
 # frontend.py
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import httpx
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime
-import json
+import orjson
 import sys
 import os
 
@@ -12,6 +18,19 @@ sys.path.append(os.path.dirname(__file__))
 
 # Configuration
 BASE_URL = "http://localhost:8000"
+HEALTH_URL = f"{BASE_URL}/health"
+PERF_URL = f"{BASE_URL}/performance"
+PROFILE_URL = f"{BASE_URL}/user-profile"
+ASK_URL = f"{BASE_URL}/ask"
+ASK_STREAM_URL = f"{BASE_URL}/ask-stream"
+TEACH_URL = f"{BASE_URL}/teach"
+RESEARCH_URL = f"{BASE_URL}/research"
+FEEDBACK_URL = f"{BASE_URL}/feedback"
+MEMORIES_URL = f"{BASE_URL}/memories"
+BATCH_DELETE_URL = f"{BASE_URL}/memories/batch-delete"
+FORCE_UPDATE_URL = f"{BASE_URL}/force-update"
+ASK_CACHE_SIZE = 64  # answers kept per session for repeated prompts
+ASK_PAYLOAD_TEMPLATE = {"query": "", "user_id": "", "threshold": 0.6, "enable_research": False}
 st.set_page_config(
     page_title="Privacy-First AI Assistant", 
     page_icon="🤖", 
@@ -19,79 +38,227 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Static UI content, built once per process rather than on every rerun
+ENHANCEMENT_ICONS = {
+    "common_sense": "💡",
+    "personalization": "🎯", 
+    "context": "🔄",
+    "web_research": "🌐"
+}
+
+TAB_LABELS = {
+    "Chat": "💬 Chat",
+    "Research": "🔍 Research",
+    "Memories": "📝 Memories",
+    "Insights": "📊 Insights"
+}
+
+TEACH_CATEGORIES = (
+    "general", "coding_life", "productivity", "motivation", "college_life", 
+    "learning", "mental_health", "personal_growth", "project_management"
+)
+
+MEMORY_FILTER_CATEGORIES = (
+    "all", "general", "coding_life", "productivity", "motivation", "college_life", 
+    "learning", "mental_health", "personal_growth", "researched_knowledge"
+)
+
+SAMPLE_TOPICS = (
+    "Python programming basics",
+    "Machine learning introduction", 
+    "Time management techniques",
+    "Web development fundamentals",
+    "Data science overview",
+    "Healthy study habits"
+)
+
+SIDEBAR_OFFLINE_HELP = """
+**To fix this:**
+1. Start the backend: `python run.py`
+2. Wait for it to fully load
+3. Refresh this page
+"""
+
+OFFLINE_HELP = """
+**To start using your AI:**
+
+1. **Start the backend server** (in a terminal):
+```bash
+python run.py
+```
+
+2. **Wait for it to fully load** (you should see "Uvicorn running on http://0.0.0.0:8000")
+
+3. **Refresh this page** once the backend is ready
+
+The backend provides the AI brain, while this frontend is just the interface!
+"""
+
+FOOTER = """
+**Privacy-First AI Assistant** • Built with Python • 
+[Report Issues](https://github.com/your-repo/issues) • 
+[Documentation](http://localhost:8000/docs)
+"""
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def _get_json(response):
+    """Decode a JSON response body with orjson"""
+    return orjson.loads(response.content)
+
+@st.cache_resource
+def get_session():
+    """One pooled keep-alive session shared by every rerun"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=1, backoff_factor=0.1))
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+class ETagCache:
+    """Last ETag and decoded body per GET, for If-None-Match revalidation.
+
+    The dashboard getters run on the event-loop thread, which cannot reach
+    st.session_state, so this lives in cache_resource behind a lock instead.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+    
+    def request_headers(self, key):
+        """Conditional headers for the next GET of key"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return {"If-None-Match": entry[0]} if entry else {}
+    
+    def payload(self, key):
+        """Body stored with the last ETag of key"""
+        with self._lock:
+            return self._entries[key][1]
+    
+    def store(self, key, etag, payload):
+        """Remember the ETag and body of a 200 response"""
+        with self._lock:
+            self._entries[key] = (etag, payload)
+
+@st.cache_resource
+def get_etag_cache():
+    """ETags shared by every rerun and session"""
+    return ETagCache()
+
+# Streamlit re-executes this module on every rerun, so the session (and the
+# ETag cache) have to come from cache_resource to actually be reused
+SESSION = get_session()
+ETAGS = get_etag_cache()
+
 def init_session_state():
     """Initialize session state variables"""
-    if "messages" not in st.session_state:
-        st.session_state.messages = []
+    if "turns" not in st.session_state:
+        st.session_state.turns = []  # (user message, assistant message) pairs
     if "teaching_mode" not in st.session_state:
         st.session_state.teaching_mode = False
     if "user_id" not in st.session_state:
-        st.session_state.user_id = f"user_{int(time.time())}"
+        # Kept in the URL so a page reload resumes the same server-side profile
+        st.session_state.user_id = st.query_params.get("uid") or f"user_{int(time.time())}"
+        st.query_params["uid"] = st.session_state.user_id
     if "research_enabled" not in st.session_state:
         st.session_state.research_enabled = False
     if "active_tab" not in st.session_state:
         st.session_state.active_tab = "Chat"
+    if "ask_cache" not in st.session_state:
+        st.session_state.ask_cache = OrderedDict()  # prompt -> response_data, LRU order
+
+# The dashboard GETs below are cached for a few seconds (through
+# fetch_dashboard_bundle) so the reruns triggered by every widget interaction
+# reuse the last response instead of refetching. Cached functions must not
+# draw anything, since Streamlit replays them.
+
+@st.cache_resource
+def get_async_client():
+    """Event loop on a daemon thread plus the AsyncClient bound to it.
+
+    An AsyncClient's connections belong to one loop, so a fresh
+    asyncio.run() per rerun could not reuse them; the loop lives here instead.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="dashboard-loop", daemon=True).start()
+    client = httpx.AsyncClient(http2=True, timeout=5.0)
+    return loop, client
+
+def _run_async(coro):
+    """Run a coroutine on the shared loop and wait for its result"""
+    loop, _ = get_async_client()
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+async def _conditional_get(url, params=None):
+    """GET JSON, revalidating with If-None-Match; None on any other status.
 
-def get_health():
+    Endpoints that send no ETag simply always answer 200.
+    """
+    _, client = get_async_client()
+    key = (url, tuple(sorted((params or {}).items())))
+    response = await client.get(url, params=params, headers=ETAGS.request_headers(key))
+    if response.status_code == 304:
+        return ETAGS.payload(key)
+    if response.status_code == 200:
+        payload = _get_json(response)
+        if "ETag" in response.headers:
+            ETAGS.store(key, response.headers["ETag"], payload)
+        return payload
+    return None
+
+async def get_health():
     """Get system health status"""
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=5)
-        if response.status_code == 200:
-            return response.json()
+        health = await _conditional_get(HEALTH_URL)
+        if health is not None:
+            return health
     except Exception as e:
-        st.error(f"Health check failed: {e}")
+        return {"status": "offline", "memory_count": 0, "rule_count": 0, "error": str(e)}
     return {"status": "offline", "memory_count": 0, "rule_count": 0}
 
-def get_performance():
+async def get_performance():
     """Get performance stats"""
     try:
-        response = requests.get(f"{BASE_URL}/performance", timeout=5)
-        if response.status_code == 200:
-            return response.json()
+        performance = await _conditional_get(PERF_URL)
+        if performance is not None:
+            return performance
     except:
         pass
     return {}
 
-def get_user_profile():
+async def get_user_profile(user_id):
     """Get user profile"""
     try:
-        response = requests.get(
-            f"{BASE_URL}/user-profile",
-            params={"user_id": st.session_state.user_id},
-            timeout=5
-        )
-        if response.status_code == 200:
-            return response.json()
+        profile = await _conditional_get(PROFILE_URL, params={"user_id": user_id})
+        if profile is not None:
+            return profile
     except:
         pass
     return {"interests": [], "topics_discussed": [], "conversation_count": 0}
 
-def send_message(query, use_research=False):
-    """Send message to AI and get response"""
+@st.cache_data(ttl=5, show_spinner=False)
+def fetch_dashboard_bundle(user_id):
+    """Fetch health, performance and profile concurrently"""
+    async def gather():
+        return await asyncio.gather(get_health(), get_performance(), get_user_profile(user_id))
+    
+    health, performance, profile = _run_async(gather())
+    return {"health": health, "performance": performance, "profile": profile}
+
+def send_message(query):
+    """Ask the AI from its memories alone, without research or user context"""
     try:
-        endpoint = "/ask-context" if use_research else "/ask"
-        
-        if use_research:
-            data = {
-                "query": query,
-                "user_id": st.session_state.user_id,
-                "threshold": 0.6,
-                "enable_research": True
-            }
-        else:
-            data = {
-                "query": query,
-                "threshold": 0.6
-            }
-            
-        response = requests.post(
-            f"{BASE_URL}{endpoint}",
-            json=data,
+        response = SESSION.post(
+            ASK_URL,
+            data=orjson.dumps({"query": query, "threshold": ASK_PAYLOAD_TEMPLATE["threshold"]}),
+            headers=JSON_HEADERS,
             timeout=15
         )
         
         if response.status_code == 200:
-            return response.json()
+            return _get_json(response)
         else:
             return {"response": f"Error: Server returned {response.status_code}", "confidence": 0.0, "source": "error"}
             
@@ -102,74 +269,140 @@ def send_message(query, use_research=False):
     except Exception as e:
         return {"response": f"Error: {str(e)}", "confidence": 0.0, "source": "error"}
 
+def stream_research_message(query, metadata):
+    """Yield a research-backed answer as it streams in; the final event's fields land in metadata"""
+    data = ASK_PAYLOAD_TEMPLATE.copy()
+    data["query"] = query
+    data["user_id"] = st.session_state.user_id
+    data["enable_research"] = True
+    metadata.update(confidence=0.0, source="error")
+    try:
+        with SESSION.post(
+            ASK_STREAM_URL,
+            data=orjson.dumps(data),
+            headers=JSON_HEADERS,
+            stream=True,
+            timeout=(5, 60)
+        ) as response:
+            if response.status_code != 200:
+                yield f"Error: Server returned {response.status_code}"
+                return
+            
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                event = orjson.loads(line[5:])
+                if event.get("final"):
+                    metadata.update(event)
+                else:
+                    yield event["delta"]
+                    
+    except requests.exceptions.ConnectionError:
+        yield "Error: Cannot connect to backend server. Make sure it's running on localhost:8000"
+    except requests.exceptions.Timeout:
+        yield "Error: Request timeout. The server is taking too long to respond."
+    except Exception as e:
+        yield f"Error: {str(e)}"
+
+def knowledge_changed():
+    """Drop everything derived from the knowledge base after teaching, research or deletes"""
+    get_memories.clear()
+    fetch_dashboard_bundle.clear()
+    st.session_state.ask_cache.clear()  # cached answers may now be wrong
+
 def teach_ai(input_text, output_text, context, category):
     """Teach the AI new knowledge"""
     try:
-        response = requests.post(
-            f"{BASE_URL}/teach",
-            json={
+        response = SESSION.post(
+            TEACH_URL,
+            data=orjson.dumps({
                 "input_text": input_text,
                 "output_text": output_text,
                 "context": context,
                 "category": category
-            },
+            }),
+            headers=JSON_HEADERS,
             timeout=10
         )
-        return response.status_code == 200, response.json() if response.status_code == 200 else response.text
+        if response.status_code == 200:
+            knowledge_changed()
+        return response.status_code == 200, _get_json(response) if response.status_code == 200 else response.text
     except Exception as e:
         return False, str(e)
 
 def research_topic(topic):
     """Research a topic online"""
     try:
-        response = requests.post(
-            f"{BASE_URL}/research",
-            json={"topic": topic, "depth": "basic"},
+        response = SESSION.post(
+            RESEARCH_URL,
+            data=orjson.dumps({"topic": topic, "depth": "basic"}),
+            headers=JSON_HEADERS,
             timeout=30
         )
-        return response.status_code == 200, response.json() if response.status_code == 200 else response.text
+        if response.status_code == 200:
+            knowledge_changed()
+        return response.status_code == 200, _get_json(response) if response.status_code == 200 else response.text
     except Exception as e:
         return False, str(e)
 
 def submit_feedback(query, response_text, rating):
     """Submit feedback to AI"""
     try:
-        response = requests.post(
-            f"{BASE_URL}/feedback",
-            json={
+        response = SESSION.post(
+            FEEDBACK_URL,
+            data=orjson.dumps({
                 "query": query,
                 "response": response_text,
                 "rating": rating
-            },
+            }),
+            headers=JSON_HEADERS,
             timeout=5
         )
         return response.status_code == 200
     except:
         return False
 
-def get_memories(limit=10):
-    """Get recent memories"""
+@st.cache_data(ttl=5, show_spinner=False)
+def get_memories(limit=10, offset=0, category=None):
+    """Get one page of recent memories, optionally filtered by category"""
+    params = {"limit": limit, "offset": offset}
+    if category and category != "all":
+        params["category"] = category
     try:
-        response = requests.get(f"{BASE_URL}/memories", params={"limit": limit}, timeout=5)
+        response = SESSION.get(MEMORIES_URL, params=params, timeout=5)
         if response.status_code == 200:
-            return response.json()
+            # /memories streams one JSON object per line
+            return [orjson.loads(line) for line in response.iter_lines() if line]
     except:
         pass
     return []
 
-def delete_memory(memory_id):
-    """Delete a memory"""
+def batch_delete_memories(memory_ids):
+    """Delete several memories in one request"""
     try:
-        response = requests.delete(f"{BASE_URL}/memories/{memory_id}", timeout=5)
-        return response.status_code == 200
+        response = SESSION.post(
+            BATCH_DELETE_URL,
+            data=orjson.dumps({"ids": memory_ids}),
+            headers=JSON_HEADERS,
+            timeout=10
+        )
+        if response.status_code == 200 and _get_json(response).get("status") == "deleted":
+            knowledge_changed()
+            return True
+        return False
     except:
         return False
 
+def delete_memory(memory_id):
+    """Delete a memory"""
+    return batch_delete_memories([memory_id])
+
 def force_update():
     """Force knowledge base update"""
     try:
-        response = requests.post(f"{BASE_URL}/force-update", timeout=10)
-        return response.status_code == 200, response.json() if response.status_code == 200 else None
+        response = SESSION.post(FORCE_UPDATE_URL, timeout=10)
+        knowledge_changed()
+        return response.status_code == 200, _get_json(response) if response.status_code == 200 else None
     except:
         return False, None
 
@@ -180,19 +413,17 @@ def render_sidebar():
         
         # Connection status
         st.subheader("System Status")
-        health = get_health()
+        dashboard = fetch_dashboard_bundle(st.session_state.user_id)
+        health = dashboard["health"]
         
         status_color = "🟢" if health["status"] == "healthy" else "🔴"
         st.write(f"{status_color} **Status:** {health['status'].upper()}")
         
         if health["status"] != "healthy":
             st.error("Backend server not connected!")
-            st.info("""
-            **To fix this:**
-            1. Start the backend: `python run.py`
-            2. Wait for it to fully load
-            3. Refresh this page
-            """)
+            if health.get("error"):
+                st.caption(f"Health check failed: {health['error']}")
+            st.info(SIDEBAR_OFFLINE_HELP)
             return False
         
         # Quick stats
@@ -204,7 +435,7 @@ def render_sidebar():
         
         # Performance stats
         with st.expander("📊 Performance"):
-            perf = get_performance()
+            perf = dashboard["performance"]
             if perf:
                 st.write(f"**Cache:** {perf.get('memory_cache_size', 0)}")
                 st.write(f"**Conversations:** {perf.get('conversation_history', 0)}")
@@ -238,14 +469,12 @@ def render_sidebar():
             with st.spinner("Refreshing..."):
                 success, result = force_update()
                 if success:
-                    st.success("Knowledge base refreshed!")
+                    st.toast("✅ Knowledge base refreshed!", icon="🔄")
                 else:
-                    st.error("Failed to refresh")
-                time.sleep(2)
-                st.rerun()
+                    st.toast("Failed to refresh", icon="⚠️")
         
         if st.button("🗑️ Clear Chat", use_container_width=True):
-            st.session_state.messages = []
+            st.session_state.turns = []
             st.rerun()
         
         if st.button("📋 View Memories", use_container_width=True):
@@ -256,7 +485,7 @@ def render_sidebar():
         
         # User insights
         st.subheader("👤 Your Profile")
-        profile = get_user_profile()
+        profile = dashboard["profile"]
         
         if profile.get('interests'):
             st.write("**Your Interests:**")
@@ -272,115 +501,122 @@ def render_sidebar():
         
         return True
 
+def _format_metadata(confidence, source, enhancement=None, research_used=False):
+    """Caption line shown under an AI answer"""
+    parts = [f"**Confidence:** {confidence:.0%}", f"**Source:** {source}"]
+    if enhancement:
+        parts.append(f"**Enhanced with:** {enhancement} {ENHANCEMENT_ICONS.get(enhancement, '✨')}")
+    if research_used:
+        parts.append("🔍 **Web Research Used**")
+    return " • ".join(parts)
+
+def _regenerate_last_turn():
+    """Drop the last turn and its cached answer so its prompt is asked again"""
+    user_msg, _ = st.session_state.turns.pop()
+    st.session_state.ask_cache.pop(user_msg["content"], None)
+    st.session_state.regenerate_prompt = user_msg["content"]
+
+def render_feedback_row(i, query, response_text):
+    """Feedback buttons for one answer"""
+    feedback_col1, feedback_col2 = st.columns(2)
+    with feedback_col1:
+        if st.button("👍", key=f"good_{i}", use_container_width=True):
+            if submit_feedback(query, response_text, 5):
+                st.toast("Thanks!", icon="👍")
+    with feedback_col2:
+        if st.button("👎", key=f"bad_{i}", use_container_width=True):
+            if submit_feedback(query, response_text, 1):
+                st.toast("Thanks for the feedback!", icon="👎")
+
+@st.fragment
 def render_chat_interface():
-    """Render the main chat interface"""
+    """Render the main chat interface.
+
+    Runs as a fragment: sending a message or clicking feedback reruns only
+    the chat panel, not the sidebar (and its HTTP calls) or the other tabs.
+    """
     st.header("💬 Chat with Your AI")
     
-    # Display chat messages
-    for i, message in enumerate(st.session_state.messages):
-        with st.chat_message(message["role"]):
-            st.markdown(message["content"])
+    # Display chat turns
+    for i, (user_msg, ai_msg) in enumerate(st.session_state.turns):
+        with st.chat_message("user"):
+            st.markdown(user_msg["content"])
+        
+        with st.chat_message("assistant"):
+            st.markdown(ai_msg["content"])
             
-            # Show metadata for AI responses
-            if message["role"] == "assistant":
-                confidence = message.get("confidence", 0)
-                source = message.get("source", "unknown")
-                
-                # Create columns for confidence and feedback
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    confidence_text = f"**Confidence:** {confidence:.0%}"
-                    source_text = f"**Source:** {source}"
-                    
-                    if message.get("enhancement"):
-                        enhancement_icons = {
-                            "common_sense": "💡",
-                            "personalization": "🎯", 
-                            "context": "🔄",
-                            "web_research": "🌐"
-                        }
-                        icon = enhancement_icons.get(message["enhancement"], "✨")
-                        enhancement_text = f"**Enhanced with:** {message['enhancement']} {icon}"
-                        st.caption(f"{confidence_text} • {source_text} • {enhancement_text}")
-                    else:
-                        st.caption(f"{confidence_text} • {source_text}")
-                
-                with col2:
-                    # Feedback buttons
-                    feedback_col1, feedback_col2 = st.columns(2)
-                    with feedback_col1:
-                        if st.button("👍", key=f"good_{i}", use_container_width=True):
-                            if submit_feedback(
-                                st.session_state.messages[i-1]["content"] if i > 0 else "",
-                                message["content"],
-                                5
-                            ):
-                                st.success("Thanks!")
-                            time.sleep(1)
-                            st.rerun()
-                    with feedback_col2:
-                        if st.button("👎", key=f"bad_{i}", use_container_width=True):
-                            if submit_feedback(
-                                st.session_state.messages[i-1]["content"] if i > 0 else "",
-                                message["content"],
-                                1
-                            ):
-                                st.info("Thanks for the feedback!")
-                            time.sleep(1)
-                            st.rerun()
+            # Create columns for confidence and feedback
+            col1, col2 = st.columns([2, 1])
+            
+            with col1:
+                st.caption(_format_metadata(
+                    ai_msg.get("confidence", 0),
+                    ai_msg.get("source", "unknown"),
+                    ai_msg.get("enhancement"),
+                    ai_msg.get("research_used", False)
+                ))
+            
+            with col2:
+                render_feedback_row(i, user_msg["content"], ai_msg["content"])
+                if i == len(st.session_state.turns) - 1:
+                    st.button("🔁 Regenerate", key="regenerate", on_click=_regenerate_last_turn,
+                              use_container_width=True)
     
     # Teaching interface (if enabled)
     if st.session_state.teaching_mode:
         render_teaching_interface()
         st.divider()
     
-    # Chat input
-    if prompt := st.chat_input("Ask me anything about coding, college, productivity..."):
-        # Add user message to chat history
-        st.session_state.messages.append({"role": "user", "content": prompt})
-        
+    # Chat input (or the prompt of a turn being regenerated)
+    prompt = st.chat_input("Ask me anything about coding, college, productivity...")
+    prompt = prompt or st.session_state.pop("regenerate_prompt", None)
+    if prompt:
         # Display user message immediately
         with st.chat_message("user"):
             st.markdown(prompt)
         
-        # Get AI response
+        # Get AI response; repeated prompts are answered from the session
+        # cache unless web research is on, which should always be fresh
+        use_research = st.session_state.research_enabled
+        cache = st.session_state.ask_cache
         with st.chat_message("assistant"):
-            with st.spinner("🤔 Thinking..."):
-                response_data = send_message(prompt, st.session_state.research_enabled)
-                
-                # Display AI response
+            if not use_research and prompt in cache:
+                cache.move_to_end(prompt)
+                response_data = cache[prompt]
+                st.markdown(response_data["response"])
+            elif use_research:
+                with st.spinner("🔍 Researching..."):
+                    response_data = {}
+                    response_data["response"] = st.write_stream(
+                        stream_research_message(prompt, response_data)
+                    )
+            else:
+                with st.spinner("🤔 Thinking..."):
+                    response_data = send_message(prompt)
                 st.markdown(response_data["response"])
-                
-                # Display metadata
-                confidence = response_data.get("confidence", 0)
-                source = response_data.get("source", "unknown")
-                enhancement = response_data.get("enhancement")
-                
-                metadata_text = f"**Confidence:** {confidence:.0%} • **Source:** {source}"
-                if enhancement:
-                    enhancement_icons = {
-                        "common_sense": "💡",
-                        "personalization": "🎯", 
-                        "context": "🔄",
-                        "web_research": "🌐"
-                    }
-                    icon = enhancement_icons.get(enhancement, "✨")
-                    metadata_text += f" • **Enhanced with:** {enhancement} {icon}"
-                
-                if response_data.get("research_used"):
-                    metadata_text += " • 🔍 **Web Research Used**"
-                
-                st.caption(metadata_text)
-        
-        # Add AI response to chat history
-        st.session_state.messages.append({
+                # "I'm not sure" and error answers must not outlive a retry
+                if not use_research and response_data.get("source") not in ("unknown", "error"):
+                    cache[prompt] = response_data
+                    if len(cache) > ASK_CACHE_SIZE:
+                        cache.popitem(last=False)
+            
+            # Display metadata
+            st.caption(_format_metadata(
+                response_data.get("confidence", 0),
+                response_data.get("source", "unknown"),
+                response_data.get("enhancement"),
+                response_data.get("research_used", False)
+            ))
+        
+        # Add the completed turn to chat history
+        st.session_state.turns.append(({"role": "user", "content": prompt}, {
             "role": "assistant",
             "content": response_data["response"],
             "confidence": response_data.get("confidence", 0),
             "source": response_data.get("source", "unknown"),
-            "enhancement": response_data.get("enhancement")
-        })
+            "enhancement": response_data.get("enhancement"),
+            "research_used": response_data.get("research_used", False)
+        }))
 
 def render_teaching_interface():
     """Render the teaching interface"""
@@ -411,8 +647,7 @@ def render_teaching_interface():
             )
             category = st.selectbox(
                 "Category",
-                ["general", "coding_life", "productivity", "motivation", "college_life", 
-                 "learning", "mental_health", "personal_growth", "project_management"],
+                TEACH_CATEGORIES,
                 key="teach_category"
             )
         
@@ -425,9 +660,8 @@ def render_teaching_interface():
                 with st.spinner("Teaching AI..."):
                     success, result = teach_ai(input_text, output_text, context, category)
                     if success:
-                        st.success("✅ Successfully taught! Your AI has learned this response.")
-                        time.sleep(2)
-                        st.rerun()
+                        # The form clears itself on submit, so no rerun is needed
+                        st.toast("✅ Successfully taught! Your AI has learned this response.", icon="📚")
                     else:
                         st.error(f"❌ Failed to teach: {result}")
 
@@ -470,23 +704,24 @@ def render_research_interface():
     
     # Sample research topics
     st.subheader("💡 Try Researching These Topics")
-    col1, col2, col3 = st.columns(3)
+    cols = st.columns(3)
     
-    sample_topics = [
-        "Python programming basics",
-        "Machine learning introduction", 
-        "Time management techniques",
-        "Web development fundamentals",
-        "Data science overview",
-        "Healthy study habits"
+    for i, topic in enumerate(SAMPLE_TOPICS):
+        if cols[i % 3].button(topic, key=f"research_{i}", use_container_width=True):
+            st.session_state.research_topic = topic
+            st.rerun()
+
+def _format_memory(memory):
+    """One markdown block per memory instead of a widget per field"""
+    lines = [
+        f"**Question:** {memory['input_text']}",
+        f"**Answer:** {memory['output_text']}"
     ]
-    
-    for i, topic in enumerate(sample_topics):
-        col = col1 if i % 3 == 0 else col2 if i % 3 == 1 else col3
-        with col:
-            if st.button(topic, key=f"research_{i}", use_container_width=True):
-                st.session_state.research_topic = topic
-                st.rerun()
+    if memory.get('context'):
+        lines.append(f"**Context:** {memory['context']}")
+    lines.append(f"**Created:** {memory['created_at']}")
+    lines.append(f"**Confidence:** {memory['confidence']:.0%}")
+    return "\n\n".join(lines)
 
 def render_memories_interface():
     """Interface for managing memories"""
@@ -498,18 +733,27 @@ def render_memories_interface():
     with col1:
         category_filter = st.selectbox(
             "Filter by category",
-            ["all", "general", "coding_life", "productivity", "motivation", "college_life", 
-             "learning", "mental_health", "personal_growth", "researched_knowledge"]
+            MEMORY_FILTER_CATEGORIES
         )
     with col2:
-        limit = st.slider("Show memories", 5, 50, 10)
+        limit = st.slider("Memories per page", 5, 50, 10)
     with col3:
         if st.button("🔄 Refresh Memories", use_container_width=True):
+            get_memories.clear()
+            st.session_state.memories_offset = 0
             st.rerun()
     
-    # Load memories
+    # Start over from the first page whenever the filter or page size changes
+    if st.session_state.get("memories_filter") != (category_filter, limit):
+        st.session_state.memories_filter = (category_filter, limit)
+        st.session_state.memories_offset = 0
+    
+    # Load memories; every page is cached, so "Load more" only fetches the new one
+    memories = []
     with st.spinner("Loading memories..."):
-        memories = get_memories(limit=limit)
+        for offset in range(0, st.session_state.memories_offset + limit, limit):
+            page = get_memories(limit=limit, offset=offset, category=category_filter)
+            memories.extend(page)
     
     if not memories:
         st.info("No memories found. Start teaching your AI or use the research feature!")
@@ -522,21 +766,27 @@ def render_memories_interface():
             col1, col2 = st.columns([4, 1])
             
             with col1:
-                st.write(f"**Question:** {memory['input_text']}")
-                st.write(f"**Answer:** {memory['output_text']}")
-                if memory.get('context'):
-                    st.write(f"**Context:** {memory['context']}")
-                st.write(f"**Created:** {memory['created_at']}")
-                st.write(f"**Confidence:** {memory['confidence']:.0%}")
+                st.markdown(_format_memory(memory))
             
             with col2:
-                if st.button("🗑️ Delete", key=f"delete_{memory['id']}", use_container_width=True):
-                    if delete_memory(memory['id']):
-                        st.success("Memory deleted!")
-                        time.sleep(1)
-                        st.rerun()
-                    else:
-                        st.error("Failed to delete memory")
+                st.checkbox("Select", key=f"sel_{memory['id']}", label_visibility="collapsed")
+    
+    # Checked memories go out in one batch-delete request
+    st.session_state.pending_deletes = [
+        memory['id'] for memory in memories if st.session_state.get(f"sel_{memory['id']}")
+    ]
+    pending = st.session_state.pending_deletes
+    if st.button(f"🗑️ Delete Selected ({len(pending)})", disabled=not pending, use_container_width=True):
+        if batch_delete_memories(pending):
+            st.toast(f"Deleted {len(pending)} memories!", icon="🗑️")
+            st.rerun()  # the deleted rows have to disappear
+        else:
+            st.error("Failed to delete memories")
+    
+    # A full last page means there may be more on the server
+    if len(page) == limit and st.button("⬇️ Load more", use_container_width=True):
+        st.session_state.memories_offset += limit
+        st.rerun()
 
 def render_insights_interface():
     """Show system insights and analytics"""
@@ -544,9 +794,10 @@ def render_insights_interface():
     
     try:
         # Get all data
-        health = get_health()
-        profile = get_user_profile()
-        performance = get_performance()
+        dashboard = fetch_dashboard_bundle(st.session_state.user_id)
+        health = dashboard["health"]
+        profile = dashboard["profile"]
+        performance = dashboard["performance"]
         
         # System Health
         st.subheader("🩺 System Health")
@@ -610,44 +861,31 @@ def main():
     
     if not is_connected:
         st.error("## 🔌 Backend Server Not Connected")
-        st.info("""
-        **To start using your AI:**
-        
-        1. **Start the backend server** (in a terminal):
-        ```bash
-        python run.py
-        ```
-        
-        2. **Wait for it to fully load** (you should see "Uvicorn running on http://0.0.0.0:8000")
-        
-        3. **Refresh this page** once the backend is ready
-        
-        The backend provides the AI brain, while this frontend is just the interface!
-        """)
+        st.info(OFFLINE_HELP)
         return
     
-    # Tab navigation
-    tabs = st.tabs(["💬 Chat", "🔍 Research", "📝 Memories", "📊 Insights"])
-    
-    with tabs[0]:
-        render_chat_interface()
-    
-    with tabs[1]:
-        render_research_interface()
-    
-    with tabs[2]:
-        render_memories_interface()
+    # Tab navigation; only the selected tab runs, unlike st.tabs which
+    # executes (and fetches for) every tab on every rerun
+    active_tab = st.radio(
+        "Tab",
+        list(TAB_LABELS),
+        format_func=TAB_LABELS.get,
+        horizontal=True,
+        label_visibility="collapsed",
+        key="active_tab"
+    )
     
-    with tabs[3]:
-        render_insights_interface()
+    renderers = {
+        "Chat": render_chat_interface,
+        "Research": render_research_interface,
+        "Memories": render_memories_interface,
+        "Insights": render_insights_interface
+    }
+    renderers[active_tab]()
     
     # Footer
     st.divider()
-    st.caption("""
-    **Privacy-First AI Assistant** • Built with Python • 
-    [Report Issues](https://github.com/your-repo/issues) • 
-    [Documentation](http://localhost:8000/docs)
-    """)
+    st.caption(FOOTER)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,7 +1,20 @@
 # interactive_import.py
+import csv
+import sys
+from pathlib import Path
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:8000"
+MAX_BULK_ITEMS = 1000  # /teach/bulk rejects larger batches
+
+# Keep-alive session reused across imports
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=Retry(total=3, backoff_factor=0.5)))
+SESSION.headers.update({"Connection": "keep-alive"})
 
 def add_single_memory():
     print("Add a new memory to your AI:")
@@ -11,7 +24,7 @@ def add_single_memory():
     context = input("Context (optional): ")
     category = input("Category: ")
     
-    response = requests.post(f"{BASE_URL}/teach", json={
+    response = SESSION.post(f"{BASE_URL}/teach", json={
         "input_text": input_text,
         "output_text": output_text,
         "context": context,
@@ -23,5 +36,42 @@ def add_single_memory():
     else:
         print("❌ Failed to add memory")
 
+def load_records(path):
+    """Read memories from a .csv file or a JSON list (or {"items": [...]})"""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            return [{key: value for key, value in row.items() if value} for row in csv.DictReader(f)]
+    records = orjson.loads(path.read_bytes())
+    return records["items"] if isinstance(records, dict) else records
+
+def bulk_import(path):
+    """Teach every record in the file, MAX_BULK_ITEMS per /teach/bulk request"""
+    records = load_records(path)
+    print(f"Importing {len(records)} memories from {path}...")
+    
+    learned = duplicates = 0
+    for start in range(0, len(records), MAX_BULK_ITEMS):
+        batch = records[start:start + MAX_BULK_ITEMS]
+        response = SESSION.post(
+            f"{BASE_URL}/teach/bulk",
+            data=orjson.dumps({"items": batch}),
+            headers={"Content-Type": "application/json"},
+            timeout=60
+        )
+        
+        result = orjson.loads(response.content) if response.status_code == 200 else {}
+        if result.get("status") != "learned":
+            error = result.get("message") or f"{response.status_code} {response.text}"
+            print(f"❌ Import failed at record {start + 1}: {error}")
+            break
+        learned += result["learned"]
+        duplicates += result["duplicates"]
+    
+    print(f"✅ Learned {learned} memories ({duplicates} duplicates skipped)")
+
 if __name__ == "__main__":
-    add_single_memory()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        bulk_import(sys.argv[1])
+    else:
+        add_single_memory()
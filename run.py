@@ -14,6 +14,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Auto-reload runs a file watcher plus a second server process; dev only
+RELOAD = os.getenv("DEV_RELOAD", "0") == "1"
+
 def check_environment():
     """Check if required environment variables are set"""
     supabase_url = os.getenv("SUPABASE_URL")
@@ -61,9 +64,12 @@ def main():
             "app.main:app",
             host="0.0.0.0",      # Allow connections from any IP
             port=8000,           # Port to run on
-            reload=True,         # Auto-reload on code changes (development)
+            reload=RELOAD,       # Auto-reload on code changes (DEV_RELOAD=1)
+            workers=1,           # The engine, its caches and the scheduler live in-process
+            loop="auto",         # uvloop when installed
+            http="auto",         # httptools when installed
             log_level="info",    # Logging level
-            access_log=True      # Enable access logs
+            access_log=RELOAD    # Access logs only while developing
         )
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
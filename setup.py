@@ -13,12 +13,21 @@ def install_requirements():
     subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
 
 def download_models():
-    """Download required models"""
-    print("Downloading embedding model...")
-    from sentence_transformers import SentenceTransformer
+    """Download required models, unless they are already cached"""
     from app.config import settings
     
-    model = SentenceTransformer('all-MiniLM-L6-v2', cache_folder=str(settings.model_cache_dir))
+    # sentence-transformers 2.2.x stores the model in <cache>/sentence-transformers_<name>
+    # and writes modules.json last, so its presence means a complete download
+    model_dir = settings.model_cache_dir / f"sentence-transformers_{settings.embedding_model}"
+    if (model_dir / "modules.json").exists():
+        print("✓ Embedding model already downloaded")
+        return
+    
+    print("Downloading embedding model...")
+    from app.core.ai_engine import load_embedding_model
+    
+    # Cached per process, so verify_setup() reuses this instance
+    load_embedding_model(settings.embedding_model)
     print("Models downloaded successfully!")
 
 def check_supabase_config():
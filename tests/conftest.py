@@ -0,0 +1,72 @@
+# tests/conftest.py
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+# app.config refuses to load without Supabase settings; tests never reach Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "test-key")
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="echomind-test-"))
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+EMBEDDING_DIM = 8
+
+class FakeMemoryStore:
+    """Keeps memories in a list instead of Supabase"""
+
+    def __init__(self):
+        self.inserted = []
+
+    def add_memories(self, memories):
+        start = len(self.inserted) + 1
+        for memory_id, memory in enumerate(memories, start):
+            self.inserted.append({"id": memory_id, "context": None, "category": "general", **memory})
+        return list(range(start, start + len(memories)))
+
+    def add_memory(self, **memory):
+        return self.add_memories([memory])[0]
+
+    def get_active_memories(self, category=None, limit=1000, offset=0):
+        return list(reversed(self.inserted))[offset:offset + limit]
+
+    def get_active_rules(self):
+        return []
+
+class FakeEncoder:
+    """Deterministic unit vectors from a text's characters; records every call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        vectors = []
+        for text in texts:
+            vector = np.random.default_rng(sum(map(ord, text))).standard_normal(EMBEDDING_DIM)
+            vectors.append(vector / np.linalg.norm(vector))
+        return np.array(vectors, dtype=np.float32)
+
+@pytest.fixture
+def engine():
+    """Engine with an empty knowledge base, without loading the model or Supabase"""
+    from app.core.ai_engine import PrivacyFirstAI
+    from app.core.dedup import NearDuplicateIndex
+
+    engine = PrivacyFirstAI.__new__(PrivacyFirstAI)
+    engine.memory_store = FakeMemoryStore()
+    engine._memory_cache = []
+    engine._embedding_cache = np.array([])
+    engine._dedup_index = NearDuplicateIndex(EMBEDDING_DIM)
+    engine._pending_updates = 0
+    engine._update_threshold = 10
+    engine._last_full_update = datetime.now(timezone.utc)
+    engine._stats = {"memory_count": 0, "rule_count": 0}
+    engine._encode = FakeEncoder()
+    return engine
@@ -0,0 +1,26 @@
+# tests/test_request_validation.py
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+# Not used as a context manager, so lifespan (and the AI engine) never starts;
+# validation fails before any handler touches the engine
+client = TestClient(app)
+
+def test_unknown_field_reports_body_loc():
+    response = client.post("/teach", json={"input_text": "q", "output_text": "a", "bogus": 1})
+
+    assert response.status_code == 422
+    assert [err["loc"] for err in response.json()["detail"]] == [["body", "bogus"]]
+
+def test_missing_field_reports_body_loc():
+    response = client.post("/ask", json={})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "query"]
+
+def test_bulk_item_error_reports_item_loc():
+    response = client.post("/teach/bulk", json={"items": [{"input_text": "q"}]})
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body", "items", 0, "output_text"]
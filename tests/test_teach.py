@@ -0,0 +1,29 @@
+# tests/test_teach.py
+def test_teach_encodes_input_once(engine):
+    result = engine.teach("What is your name?", "I'm your assistant.")
+
+    assert result["status"] == "learned"
+    assert engine._encode.calls == [["What is your name?"]]
+    # Searchable right away, without a pending incremental update
+    assert [memory["id"] for memory in engine._memory_cache] == [result["memory_id"]]
+    assert engine._embedding_cache.shape == (1, 8)
+
+def test_teach_then_repeat_is_duplicate(engine):
+    first = engine.teach("What is your name?", "I'm your assistant.")
+
+    second = engine.teach("What is your name?", "I'm your assistant.")
+
+    assert second["status"] == "duplicate"
+    assert second["memory_id"] == first["memory_id"]
+
+def test_memory_written_to_store_is_searchable_after_note(engine):
+    engine.teach("What is your name?", "I'm your assistant.")
+    # e.g. a research answer saved straight to the store
+    engine.memory_store.add_memory(input_text="Who made you?", output_text="You did.")
+    engine._note_external_writes(1)
+
+    answer = engine.ask("Who made you?", threshold=0.9)
+
+    assert answer["source"] == "memory"
+    assert answer["response"] == "You did."
+    assert engine._pending_updates == 0
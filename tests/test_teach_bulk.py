@@ -0,0 +1,30 @@
+# tests/test_teach_bulk.py
+ITEM = {"input_text": "What is your name?", "output_text": "I'm your assistant."}
+
+def test_same_item_twice_in_one_batch_is_learned_once(engine):
+    result = engine.teach_bulk([dict(ITEM), dict(ITEM)])
+
+    assert result["learned"] == 1
+    assert result["duplicates"] == 1
+    assert result["duplicate_ids"] == result["memory_ids"]
+    assert len(engine.memory_store.inserted) == 1
+
+def test_near_duplicate_within_batch_is_skipped(engine):
+    # The fake encoder only looks at the characters, so this reordered
+    # question embeds identically without being an exact repeat
+    repeat = {"input_text": "your name is What?", "output_text": ITEM["output_text"]}
+    other = {"input_text": "Who made you?", "output_text": "You did."}
+
+    result = engine.teach_bulk([dict(ITEM), other, dict(ITEM), repeat])
+
+    assert result["learned"] == 2
+    assert result["duplicates"] == 2
+    assert result["duplicate_ids"] == [result["memory_ids"][0]] * 2
+
+def test_repeat_of_earlier_batch_is_not_reinserted(engine):
+    first = engine.teach_bulk([dict(ITEM)])
+
+    second = engine.teach_bulk([dict(ITEM)])
+
+    assert second["learned"] == 0
+    assert second["duplicate_ids"] == first["memory_ids"]
@@ -1,42 +1,72 @@
 # train_ai.py
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 import requests
-import time
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:8000"
 
+# Keep-alive session shared by every call; payloads are pre-encoded with orjson
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=Retry(total=3, backoff_factor=0.2)))
+SESSION.headers.update({"Content-Type": "application/json", "Connection": "keep-alive"})
+
+def _post(path, payload):
+    """POST an orjson-encoded payload and decode the JSON reply"""
+    response = SESSION.post(BASE_URL + path, data=orjson.dumps(payload))
+    return orjson.loads(response.content)
+
 def teach_ai(input_text, output_text, category="general"):
-    response = requests.post(f"{BASE_URL}/teach", json={
+    result = _post("/teach", {
         "input_text": input_text,
         "output_text": output_text,
         "category": category
     })
     print(f"✅ Taught: '{input_text}' -> '{output_text}'")
-    return response.json()
+    return result
+
+def teach_many(items):
+    """Teach (input_text, output_text, category) triples in one /teach/bulk request"""
+    result = _post("/teach/bulk", {"items": [
+        {"input_text": input_text, "output_text": output_text, "category": category}
+        for input_text, output_text, category in items
+    ]})
+    for input_text, output_text, _ in items:
+        print(f"✅ Taught: '{input_text}' -> '{output_text}'")
+    print(f"   ({result.get('duplicates', 0)} already known)")
+    return result
 
 def add_rule(pattern, action):
-    response = requests.post(f"{BASE_URL}/rules", json={
+    result = _post("/rules", {
         "pattern": pattern,
         "action": action,
         "priority": 1
     })
     print(f"✅ Added rule: '{pattern}' -> '{action}'")
-    return response.json()
+    return result
 
-def ask_ai(query):
-    response = requests.post(f"{BASE_URL}/ask", json={
+def fetch_answer(query):
+    """POST /ask without printing, so it can run on worker threads"""
+    return _post("/ask", {
         "query": query,
         "threshold": 0.6
     })
-    result = response.json()
+
+def print_answer(query, result):
     print(f"❓ Q: {query}")
     print(f"🤖 A: {result['response']} (confidence: {result['confidence']:.2f}, source: {result['source']})")
     print("---")
+
+def ask_ai(query):
+    result = fetch_answer(query)
+    print_answer(query, result)
     return result
 
 def get_health():
-    response = requests.get(f"{BASE_URL}/health")
-    return response.json()
+    response = SESSION.get(f"{BASE_URL}/health")
+    return orjson.loads(response.content)
 
 # Training session
 if __name__ == "__main__":
@@ -51,17 +81,20 @@ if __name__ == "__main__":
     add_rule("thank you", "You're welcome! I'm glad I could help.")
     add_rule("bye", "Goodbye! Feel free to come back anytime.")
     
-    # Teach personal information
-    teach_ai("What is your name?", "I'm your personal AI assistant! You can call me whatever you like.", "introduction")
-    teach_ai("Who are you?", "I'm your AI companion, created to help you with tasks and conversations.", "introduction")
-    
-    # Teach preferences
-    teach_ai("What do you like?", "I enjoy learning new things from you and helping with your questions!", "preferences")
-    teach_ai("What is your favorite color?", "I think blue is quite nice, but I'm happy with whatever you prefer!", "preferences")
-    
-    # Teach factual information
-    teach_ai("What can you do?", "I can answer questions based on what you teach me, help organize information, and have conversations with you!", "capabilities")
-    teach_ai("How do you work?", "I learn from our conversations and use semantic search to find the most relevant responses from what you've taught me.", "capabilities")
+    # Teach everything in one batch (one request, one batched encode)
+    teach_many([
+        # Personal information
+        ("What is your name?", "I'm your personal AI assistant! You can call me whatever you like.", "introduction"),
+        ("Who are you?", "I'm your AI companion, created to help you with tasks and conversations.", "introduction"),
+        
+        # Preferences
+        ("What do you like?", "I enjoy learning new things from you and helping with your questions!", "preferences"),
+        ("What is your favorite color?", "I think blue is quite nice, but I'm happy with whatever you prefer!", "preferences"),
+        
+        # Factual information
+        ("What can you do?", "I can answer questions based on what you teach me, help organize information, and have conversations with you!", "capabilities"),
+        ("How do you work?", "I learn from our conversations and use semantic search to find the most relevant responses from what you've taught me.", "capabilities"),
+    ])
     
     # Test the AI
     print("\n🧪 Testing the AI...\n")
@@ -79,9 +112,10 @@ if __name__ == "__main__":
         "Goodbye!"
     ]
     
-    for question in test_questions:
-        ask_ai(question)
-        time.sleep(0.5)  # Small delay between questions
+    # The questions are independent, so ask them concurrently and print in order
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for question, result in zip(test_questions, executor.map(fetch_answer, test_questions)):
+            print_answer(question, result)
     
     print("🎉 Training session complete!")
     